@@ -2,7 +2,7 @@ from collections.abc import Generator
 from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, SQLModel, create_engine, text
 
 from .config import get_settings
 from .logging_config import get_logger
@@ -15,6 +15,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Indexes that older databases still carry but the models no longer declare
+OBSOLETE_INDEXES = ("ix_task_status",)
+
 
 def _create_engine() -> Engine:
     connect_args = {
@@ -36,6 +39,21 @@ engine = _create_engine()
 def create_db_and_tables() -> None:
     logger.info("Initializing database", db_url=get_settings().db_url)
     SQLModel.metadata.create_all(engine)
+
+    # create_all() skips tables that already exist, so indexes added after a
+    # database was first created have to be created explicitly.
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    with engine.begin() as connection:
+        for name in OBSOLETE_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    # Refresh planner statistics where needed so partial indexes get used
+    with engine.begin() as connection:
+        connection.execute(text("PRAGMA optimize=0x10002"))
+
     logger.info("Database initialized successfully")
 
 
@@ -1,6 +1,6 @@
-import asyncio
 import platform
 import shutil
+from functools import cache
 from pathlib import Path
 
 from .config import get_settings
@@ -13,6 +13,7 @@ KEPUBIFY_VERSION = "v4.0.4"
 KEPUBIFY_DOWNLOAD_BASE = (
     f"https://github.com/pgaskin/kepubify/releases/download/{KEPUBIFY_VERSION}"
 )
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 
 class KepubifyBinary:
@@ -21,29 +22,7 @@ class KepubifyBinary:
         self._cached_path: str | None = None
 
     def _get_platform_binary_name(self) -> str:
-        system = platform.system().lower()
-        machine = platform.machine().lower()
-
-        match (system, machine):
-            case ("darwin", m) if "arm" in m or "aarch64" in m:
-                return "kepubify-darwin-arm64"
-            case ("darwin", _):
-                return "kepubify-darwin-64bit"
-            case ("linux", m) if "aarch64" in m or "arm64" in m:
-                return "kepubify-linux-arm64"
-            case ("linux", m) if "arm" in m:
-                return "kepubify-linux-arm"
-            case ("linux", _):
-                return "kepubify-linux-64bit"
-            case ("windows", _):
-                return "kepubify-windows-64bit.exe"
-            case _:
-                logger.warning(
-                    "Unknown platform, defaulting to linux-64bit",
-                    system=system,
-                    machine=machine,
-                )
-                return "kepubify-linux-64bit"
+        return _platform_binary_name()
 
     def _find_existing(self) -> str | None:
         system_binary = shutil.which("kepubify")
@@ -85,14 +64,21 @@ class KepubifyBinary:
 
         try:
             client = await HttpClientManager.get_client()
-            response = await client.get(download_url)
-            response.raise_for_status()
 
             self.bin_dir.mkdir(parents=True, exist_ok=True)
             local_path = self.bin_dir / binary_name
+            # Stream into a temporary file so an interrupted download is never
+            # mistaken for an installed binary by _find_existing().
+            part_path = local_path.with_name(f"{binary_name}.part")
 
-            await asyncio.to_thread(local_path.write_bytes, response.content)
-            local_path.chmod(0o755)
+            async with client.stream("GET", download_url) as response:
+                response.raise_for_status()
+                with part_path.open("wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+
+            part_path.chmod(0o755)
+            part_path.replace(local_path)
 
             self._cached_path = str(local_path)
             log.info("Kepubify downloaded successfully", path=str(local_path))
@@ -102,3 +88,31 @@ class KepubifyBinary:
         except Exception as e:
             log.error("Failed to download kepubify", error=str(e), exc_info=True)
             raise RuntimeError(f"Cannot download kepubify: {e}") from e
+
+
+@cache
+def _platform_binary_name() -> str:
+    # The platform cannot change within a process, so resolve it once.
+    system = platform.system().lower()
+    machine = platform.machine().lower()
+
+    match (system, machine):
+        case ("darwin", m) if "arm" in m or "aarch64" in m:
+            return "kepubify-darwin-arm64"
+        case ("darwin", _):
+            return "kepubify-darwin-64bit"
+        case ("linux", m) if "aarch64" in m or "arm64" in m:
+            return "kepubify-linux-arm64"
+        case ("linux", m) if "arm" in m:
+            return "kepubify-linux-arm"
+        case ("linux", _):
+            return "kepubify-linux-64bit"
+        case ("windows", _):
+            return "kepubify-windows-64bit.exe"
+        case _:
+            logger.warning(
+                "Unknown platform, defaulting to linux-64bit",
+                system=system,
+                machine=machine,
+            )
+            return "kepubify-linux-64bit"
@@ -15,6 +15,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Everything that can't be part of an ISBN (applied to upper-cased text)
+NON_ISBN_CHARS = re.compile(r"[^0-9X]")
+
 
 class PdfMetadataExtractor:
     def extract(self, filepath: str) -> BookMetadata:
@@ -49,11 +52,7 @@ class PdfMetadataExtractor:
                         logger.debug("Failed to parse XMP stream", error=str(e))
 
                 if metadata.get("isbn"):
-                    metadata["isbn"] = re.sub(
-                        r"[^0-9X]",
-                        "",
-                        metadata["isbn"].upper(),
-                    )
+                    metadata["isbn"] = NON_ISBN_CHARS.sub("", metadata["isbn"].upper())
 
             finally:
                 doc.close()
@@ -268,16 +267,15 @@ class PdfMetadataExtractor:
         if not text:
             return None
 
-        if "urn:isbn:" in text.lower():
-            cleaned = re.sub(r"[^0-9X]", "", text.upper())
-            if len(cleaned) in (10, 13):
-                return cleaned
-
-        cleaned = re.sub(r"[^0-9X]", "", text.upper())
-        if len(cleaned) in (10, 13):
-            if len(cleaned) == 13 and cleaned.startswith(("978", "979")):
-                return cleaned
-            if len(cleaned) == 10:
-                return cleaned
+        cleaned = NON_ISBN_CHARS.sub("", text.upper())
+        if len(cleaned) == 10:
+            return cleaned
+
+        # A bare 13-digit number is only trusted with an ISBN prefix unless
+        # the text explicitly says it is an ISBN.
+        if len(cleaned) == 13 and (
+            "urn:isbn:" in text.lower() or cleaned.startswith(("978", "979"))
+        ):
+            return cleaned
 
         return None
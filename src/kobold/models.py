@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Any
 from uuid import UUID, uuid4
 
-from sqlmodel import JSON, Field, SQLModel
+from sqlmodel import JSON, Field, Index, SQLModel, text
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Task Queue Models
@@ -12,6 +12,7 @@ from sqlmodel import JSON, Field, SQLModel
 
 class TaskStatus(str, Enum):
     PENDING = "PENDING"
+    CLAIMED = "CLAIMED"  # Reserved by a worker batch, not yet started
     PROCESSING = "PROCESSING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
@@ -19,10 +20,24 @@ class TaskStatus(str, Enum):
 
 
 class Task(SQLModel, table=True):
+    __table_args__ = (
+        # Matches the fetch_tasks claim query: filter on status, then
+        # order by next_retry_at and created_at.
+        Index("ix_task_claim", "status", "next_retry_at", "created_at"),
+        # Stale-task recovery only ever looks at PROCESSING rows, which are a
+        # handful at any time.
+        Index(
+            "ix_task_processing_started",
+            "started_at",
+            sqlite_where=text("status = 'PROCESSING'"),
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     type: str = Field(index=True)  # Task type string, e.g. "INGEST", "CONVERT"
     payload: dict[str, Any] = Field(default_factory=dict, sa_type=JSON)
-    status: TaskStatus = Field(default=TaskStatus.PENDING, index=True)
+    # Covered by ix_task_claim, which leads with status
+    status: TaskStatus = Field(default=TaskStatus.PENDING)
     error_message: str | None = None
 
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), index=True)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import errno
+import os
 import shutil
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from .logging_config import get_logger
-from .utils.hashing import get_file_hash
+from .utils.hashing import clear_hash_cache, get_file_hash
 from .utils.paths import (
     PathTemplate,
     sanitize_filename,
@@ -64,27 +66,44 @@ class LibraryOrganizer:
         if not self.settings.ORGANIZE_LIBRARY:
             return None
 
+        original_path, new_path = self.get_organize_path(book)
+
+        # Checked before binding context: this is the common case and only
+        # logs at debug level.
+        if new_path == original_path:
+            logger.debug("Book already in correct location", path=book.file_path)
+            return None
+
         log = logger.bind(
             book_id=str(book.id)[:8],
             title=book.title,
             current_path=book.file_path,
         )
 
-        original_path, new_path = self.get_organize_path(book)
-
-        if new_path == original_path:
-            log.debug("Book already in correct location")
-            return None
+        # One stat() both detects a collision and provides the size check
+        try:
+            target_size: int | None = new_path.stat().st_size
+        except FileNotFoundError:
+            target_size = None
 
-        if new_path.exists():
+        if target_size is not None:
             try:
-                target_hash = get_file_hash(new_path)
-                if target_hash == book.file_hash:
+                source_size = (
+                    book.file_size
+                    if book.file_size is not None
+                    else original_path.stat().st_size
+                )
+                # Files of different sizes can't be identical; skip reading
+                # the whole target just to find that out.
+                if target_size != source_size:
+                    log.debug("Target file differs in size, skipping hash check")
+                elif get_file_hash(new_path) == book.file_hash:
                     log.info(
                         "Target file has identical content, overwriting (deduplication)"
                     )
                     try:
                         original_path.unlink()
+                        clear_hash_cache()
                         log.info(
                             "Deleted redundant source file", source=str(original_path)
                         )
@@ -109,7 +128,8 @@ class LibraryOrganizer:
             raise
 
         try:
-            shutil.move(str(original_path), str(new_path))
+            _move_file(original_path, new_path)
+            clear_hash_cache()
             log.info("Moved book", new_path=str(new_path))
         except OSError as e:
             log.error("Failed to move book", error=str(e))
@@ -125,7 +145,7 @@ class LibraryOrganizer:
                     kepub_new_path = _generate_unique_path(kepub_new_path)
 
                 try:
-                    shutil.move(str(kepub_original), str(kepub_new_path))
+                    _move_file(kepub_original, kepub_new_path)
                     book.kepub_path = str(kepub_new_path)
                     log.debug("Moved kepub", kepub_path=str(kepub_new_path))
                 except OSError as e:
@@ -134,16 +154,31 @@ class LibraryOrganizer:
         return str(new_path)
 
 
+def _move_file(source: Path, target: Path) -> None:
+    """Move a file, renaming atomically when source and target share a device."""
+    try:
+        source.replace(target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(source), str(target))
+
+
 def _generate_unique_path(path: Path) -> Path:
-    counter = 1
     stem = path.stem
     suffix = path.suffix
     parent = path.parent
 
-    while True:
-        new_path = parent / f"{stem}_{counter}{suffix}"
-        if not new_path.exists():
-            return new_path
-        counter += 1
-        if counter > 1000:
-            raise OSError(f"Could not generate unique path for {path}")
+    # List the directory once instead of probing each candidate with stat()
+    try:
+        with os.scandir(parent) as entries:
+            existing = {entry.name for entry in entries}
+    except FileNotFoundError:
+        existing = set()
+
+    for counter in range(1, 1001):
+        name = f"{stem}_{counter}{suffix}"
+        if name not in existing:
+            return parent / name
+
+    raise OSError(f"Could not generate unique path for {path}")
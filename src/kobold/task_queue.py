@@ -4,9 +4,10 @@ import asyncio
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from sqlmodel import Session, col, select
+from sqlmodel import Session, col, func, select, update
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable
     from uuid import UUID
 
     from sqlalchemy.engine import Engine
@@ -24,10 +25,19 @@ TASK_STALE_MINUTES = 15
 
 
 class TaskQueue:
-    def __init__(self, settings: Settings, engine: Engine):
+    def __init__(
+        self,
+        settings: Settings,
+        engine: Engine,
+        on_task_enqueued: Callable[[Task], None] | None = None,
+    ):
         self.settings = settings
         self.engine = engine
+        # Called with each newly committed task, e.g. to observe the queue
+        # without polling the database.
+        self.on_task_enqueued = on_task_enqueued
         self._task_event: asyncio.Event | None = None
+        self._idle_event: asyncio.Event | None = None
 
     @property
     def task_event(self) -> asyncio.Event:
@@ -36,44 +46,121 @@ class TaskQueue:
             self._task_event = asyncio.Event()
         return self._task_event
 
+    @property
+    def idle_event(self) -> asyncio.Event:
+        """Get or create the queue idle event (lazy initialization).
+
+        Set while no task is pending or processing. The state is only
+        tracked once this event has been requested.
+        """
+        if self._idle_event is None:
+            self._idle_event = asyncio.Event()
+            self._update_idle_event()
+        return self._idle_event
+
+    def _update_idle_event(self) -> None:
+        if self._idle_event is None:
+            return
+        if self.has_active_tasks():
+            self._idle_event.clear()
+        else:
+            self._idle_event.set()
+
     def notify(self) -> None:
         """Signal that a task is available for processing."""
         self.task_event.set()
 
+    def notify_later(self, delay_seconds: float) -> None:
+        """Signal the worker once a delayed task becomes due.
+
+        Without this, a task scheduled for retry would only be picked up on
+        the worker's next poll. No-op when called outside an event loop.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.call_later(delay_seconds, self.notify)
+
     def add_task(
         self,
         task_type: str,
         payload: dict[str, Any],
     ) -> Task:
-        with Session(self.engine) as session:
-            task = Task(
+        return self.add_tasks(task_type, [payload])[0]
+
+    def add_tasks(
+        self,
+        task_type: str,
+        payloads: Iterable[dict[str, Any]],
+    ) -> list[Task]:
+        """Enqueue several tasks of one type in a single transaction."""
+        tasks = [
+            Task(
                 type=task_type,
                 payload=payload,
                 status=TaskStatus.PENDING,
                 max_retries=TASK_MAX_RETRIES,
             )
-            session.add(task)
+            for payload in payloads
+        ]
+        if not tasks:
+            return tasks
+
+        # All column defaults are generated client-side, so the committed
+        # objects are already complete and don't need a refresh.
+        with Session(self.engine, expire_on_commit=False) as session:
+            session.add_all(tasks)
             session.commit()
-            session.refresh(task)
 
+        for task in tasks:
             logger.info(
                 "Task added to queue",
                 task_id=str(task.id),
                 task_type=task_type,
             )
 
-            self.notify()
-            return task
+        if self._idle_event is not None:
+            self._idle_event.clear()
+        self.notify()
+        if self.on_task_enqueued is not None:
+            for task in tasks:
+                self.on_task_enqueued(task)
+        return tasks
 
     def fetch_next_task(self) -> Task | None:
+        """Atomically claim the next runnable task and mark it started."""
+        tasks = self._claim_tasks(1, start=True)
+        return tasks[0] if tasks else None
+
+    def fetch_tasks(self, limit: int) -> list[Task]:
+        """Atomically claim up to ``limit`` runnable tasks, in queue order.
+
+        Claimed tasks are CLAIMED rather than PROCESSING: they only count as
+        started once ``start_task`` is called for each of them.
+        """
+        return self._claim_tasks(limit, start=False)
+
+    def _claim_tasks(self, limit: int, *, start: bool) -> list[Task]:
+        """Claim runnable tasks, optionally marking them started.
+
+        Selection and the transition out of PENDING happen in a single
+        UPDATE ... RETURNING statement, so two workers can never claim the
+        same row and no separate refresh round-trip is needed.
+        """
         now = datetime.now(UTC)
+        values: dict[str, Any] = (
+            {"status": TaskStatus.PROCESSING, "started_at": now}
+            if start
+            else {"status": TaskStatus.CLAIMED}
+        )
 
-        with Session(self.engine) as session:
+        with Session(self.engine, expire_on_commit=False) as session:
             next_retry_col = col(Task.next_retry_at)
             created_at_col = col(Task.created_at)
 
-            statement = (
-                select(Task)
+            candidates = (
+                select(col(Task.id))
                 .where(Task.status == TaskStatus.PENDING)
                 .where(
                     (next_retry_col == None)  # noqa: E711 SQLAlchemy comparison
@@ -83,27 +170,75 @@ class TaskQueue:
                     next_retry_col.asc().nulls_last(),
                     created_at_col.asc(),
                 )
-                .limit(1)
+                .limit(limit)
             )
 
-            task = session.exec(statement).first()
+            statement = (
+                update(Task)
+                .where(col(Task.id).in_(candidates))
+                .values(**values)
+                .returning(Task)
+                .execution_options(synchronize_session=False)
+            )
 
-            if task:
-                task.status = TaskStatus.PROCESSING
-                task.started_at = now
-                session.add(task)
-                session.commit()
-                session.refresh(task)
+            tasks = list(session.scalars(statement))
+            session.commit()
 
-                logger.debug(
-                    "Task claimed for processing",
-                    task_id=str(task.id),
-                    task_type=task.type,
-                    retry_count=task.retry_count,
-                )
-                return task
+        # RETURNING yields rows in no guaranteed order, so restore the
+        # ordering the subquery selected them by.
+        tasks.sort(
+            key=lambda t: (
+                t.next_retry_at is None,
+                t.next_retry_at or t.created_at,
+                t.created_at,
+            )
+        )
+
+        for task in tasks:
+            logger.debug(
+                "Task claimed for processing",
+                task_id=str(task.id),
+                task_type=task.type,
+                retry_count=task.retry_count,
+            )
+
+        return tasks
+
+    def start_task(self, task: Task) -> None:
+        """Mark a claimed task as started, just before it is processed."""
+        now = datetime.now(UTC)
+
+        with Session(self.engine) as session:
+            statement = (
+                update(Task)
+                .where(col(Task.id) == task.id)
+                .where(col(Task.status) == TaskStatus.CLAIMED)
+                .values(status=TaskStatus.PROCESSING, started_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            session.execute(statement)
+            session.commit()
 
-            return None
+        task.status = TaskStatus.PROCESSING
+        task.started_at = now
+
+    def release_tasks(self, task_ids: Collection[UUID]) -> None:
+        """Return claimed but unstarted tasks to the queue."""
+        if not task_ids:
+            return
+
+        with Session(self.engine) as session:
+            statement = (
+                update(Task)
+                .where(col(Task.id).in_(task_ids))
+                .where(col(Task.status) == TaskStatus.CLAIMED)
+                .values(status=TaskStatus.PENDING)
+                .execution_options(synchronize_session=False)
+            )
+            session.execute(statement)
+            session.commit()
+
+        logger.debug("Released unstarted tasks", count=len(task_ids))
 
     def complete_task(
         self,
@@ -112,7 +247,7 @@ class TaskQueue:
         error: str | None = None,
         status: TaskStatus | None = None,
     ) -> None:
-        with Session(self.engine) as session:
+        with Session(self.engine, expire_on_commit=False) as session:
             task = session.get(Task, task_id)
             if not task:
                 logger.warning(
@@ -141,6 +276,8 @@ class TaskQueue:
                 error=error[:100] if error else None,
             )
 
+        self._update_idle_event()
+
     def retry_task(
         self,
         task_id: UUID,
@@ -148,7 +285,7 @@ class TaskQueue:
         *,
         delay_seconds: int | None = None,
     ) -> None:
-        with Session(self.engine) as session:
+        with Session(self.engine, expire_on_commit=False) as session:
             task = session.get(Task, task_id)
             if not task:
                 logger.warning("Attempted to retry unknown task", task_id=str(task_id))
@@ -165,6 +302,8 @@ class TaskQueue:
             session.add(task)
             session.commit()
 
+            self.notify_later(delay_seconds)
+
             logger.warning(
                 "Task scheduled for retry",
                 task_id=str(task_id),
@@ -178,42 +317,74 @@ class TaskQueue:
 
         with Session(self.engine) as session:
             started_at_col = col(Task.started_at)
-            stale_tasks = session.exec(
-                select(Task)
-                .where(Task.status == TaskStatus.PROCESSING)
+            statement = (
+                update(Task)
+                .where(col(Task.status) == TaskStatus.PROCESSING)
                 .where(started_at_col < cutoff)
+                .values(
+                    status=TaskStatus.PENDING,
+                    started_at=None,
+                    retry_count=col(Task.retry_count) + 1,
+                    error_message="Task recovered from stale state",
+                )
+                .returning(col(Task.id), col(Task.type))
+                .execution_options(synchronize_session=False)
+            )
+
+            recovered = session.exec(statement).all()
+
+            # Recovery runs before the worker starts, so any claim still held
+            # belongs to a worker that died mid-batch. Those tasks never ran
+            # and go back to the queue without using up a retry.
+            released = session.exec(
+                update(Task)
+                .where(col(Task.status) == TaskStatus.CLAIMED)
+                .values(status=TaskStatus.PENDING)
+                .returning(col(Task.id))
+                .execution_options(synchronize_session=False)
             ).all()
+            session.commit()
 
-            for task in stale_tasks:
-                task.status = TaskStatus.PENDING
-                task.started_at = None
-                task.retry_count += 1
-                task.error_message = "Task recovered from stale state"
-                session.add(task)
+        if released:
+            logger.info("Released orphaned task claims", count=len(released))
 
-                logger.warning(
-                    "Recovered stale task",
-                    task_id=str(task.id),
-                    task_type=task.type,
-                    was_started_at=task.started_at.isoformat()
-                    if task.started_at
-                    else None,
-                )
+        for task_id, task_type in recovered:
+            logger.warning(
+                "Recovered stale task",
+                task_id=str(task_id),
+                task_type=task_type,
+            )
 
-            session.commit()
+        if recovered:
+            logger.info(
+                "Stale task recovery complete",
+                recovered_count=len(recovered),
+            )
 
-            if stale_tasks:
-                logger.info(
-                    "Stale task recovery complete",
-                    recovered_count=len(stale_tasks),
-                )
+        return len(recovered) + len(released)
 
-            return len(stale_tasks)
+    def has_active_tasks(self) -> bool:
+        """Return True if any task is pending, claimed or processing."""
+        with Session(self.engine) as session:
+            statement = (
+                select(col(Task.id))
+                .where(
+                    col(Task.status).in_(
+                        [TaskStatus.PENDING, TaskStatus.CLAIMED, TaskStatus.PROCESSING]
+                    )
+                )
+                .limit(1)
+            )
+            return session.exec(statement).first() is not None
 
     def get_queue_stats(self) -> dict[str, int]:
         with Session(self.engine) as session:
-            stats = {}
-            for status in TaskStatus:
-                count = session.exec(select(Task).where(Task.status == status)).all()
-                stats[status.value] = len(count)
-            return stats
+            status_col = col(Task.status)
+            rows = session.exec(
+                select(status_col, func.count()).group_by(status_col)
+            ).all()
+
+        stats = dict.fromkeys((status.value for status in TaskStatus), 0)
+        for status, count in rows:
+            stats[status.value] = count
+        return stats
@@ -53,6 +53,13 @@ class IngestTask(Task):
                 await self._handle_delete(filepath, log)
             case "ADD" | "MODIFIED":
                 await self._handle_add(filepath, log)
+            case "RENAME":
+                old_path_str = payload.get("old_path")
+                if not old_path_str:
+                    log.warning("Rename task missing old_path, ingesting as add")
+                    await self._handle_add(filepath, log)
+                    return
+                await self._handle_rename(Path(old_path_str), filepath, log)
             case _:
                 log.warning("Unknown ingest event type")
 
@@ -74,6 +81,14 @@ class IngestTask(Task):
             else:
                 log.debug("No book found for deleted file")
 
+    async def _handle_rename(
+        self, old_path: Path, filepath: Path, log: structlog.stdlib.BoundLogger
+    ) -> None:
+        # Adding first lets a matching hash heal the existing book's path, so
+        # the delete only marks a book when the pair was not a real rename.
+        await self._handle_add(filepath, log)
+        await self._handle_delete(old_path, log.bind(old_path=str(old_path)))
+
     async def _handle_add(
         self, filepath: Path, log: structlog.stdlib.BoundLogger
     ) -> None:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
@@ -13,6 +14,7 @@ from ..models import Book
 from .base import Task
 
 if TYPE_CHECKING:
+    import structlog
     from sqlalchemy.engine import Engine
 
     from ..config import Settings
@@ -79,10 +81,25 @@ class MetadataTask(Task):
                         setattr(book, field, value)
                         updated_fields.append(field)
 
-            if updated_fields:
+            if not updated_fields:
+                log.debug("No new metadata to update")
+                return
+
+            cover_task: asyncio.Task[bytes | None] | None = None
+            cover_path = metadata.get("cover_path")
+            if (
+                self.settings.EMBED_METADATA
+                and cover_path
+                and cover_path.startswith("http")
+            ):
+                cover_task = asyncio.create_task(self._download_cover(cover_path, log))
+
+            try:
                 book.mark_updated()
                 session.add(book)
-                session.commit()
+                # Commit off the event loop so the cover download keeps
+                # progressing while SQLite writes.
+                await asyncio.to_thread(session.commit)
                 log.info(
                     "Metadata updated",
                     updated_fields=updated_fields,
@@ -90,36 +107,38 @@ class MetadataTask(Task):
                 )
 
                 if self.settings.EMBED_METADATA:
-                    cover_path = metadata.get("cover_path")
-                    if cover_path and cover_path.startswith("http"):
-                        try:
-                            client = await HttpClientManager.get_client()
-                            response = await client.get(cover_path)
-                            if response.status_code == 200:
-                                metadata["cover_data"] = response.content
-                                log.info(
-                                    "Downloaded cover image",
-                                    url=cover_path,
-                                    size=len(response.content),
-                                )
-                            else:
-                                log.warning(
-                                    "Failed to download cover image",
-                                    status=response.status_code,
-                                )
-                        except Exception as e:
-                            log.warning("Error downloading cover image", error=str(e))
+                    if cover_task is not None:
+                        cover_data = await cover_task
+                        if cover_data is not None:
+                            metadata["cover_data"] = cover_data
 
                     self.metadata_manager.embed_metadata(book.file_path, metadata)
+            finally:
+                if cover_task is not None:
+                    cover_task.cancel()
 
-                if self.settings.ORGANIZE_LIBRARY:
-                    from .organize import OrganizeTask
+            if self.settings.ORGANIZE_LIBRARY:
+                from .organize import OrganizeTask
 
-                    log.info("Queueing organization task")
-                    self.queue.add_task(
-                        OrganizeTask.TASK_TYPE,
-                        payload={"book_id": str(book.id)},
-                    )
+                log.info("Queueing organization task")
+                self.queue.add_task(
+                    OrganizeTask.TASK_TYPE,
+                    payload={"book_id": str(book.id)},
+                )
 
-            else:
-                log.debug("No new metadata to update")
+    async def _download_cover(
+        self, url: str, log: structlog.stdlib.BoundLogger
+    ) -> bytes | None:
+        try:
+            client = await HttpClientManager.get_client()
+            response = await client.get(url)
+        except Exception as e:
+            log.warning("Error downloading cover image", error=str(e))
+            return None
+
+        if response.status_code != 200:
+            log.warning("Failed to download cover image", status=response.status_code)
+            return None
+
+        log.info("Downloaded cover image", url=url, size=len(response.content))
+        return response.content
@@ -103,7 +103,7 @@ class OrganizeTask(Task):
 
                     raise FileNotFoundError(f"Source file {current_path} not found")
 
-                new_path = self.organizer.organize_book(book)
+                new_path = await asyncio.to_thread(self.organizer.organize_book, book)
 
                 if new_path:
                     book.file_path = new_path
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 
 import xxhash
@@ -6,16 +7,41 @@ from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
-CHUNK_SIZE = 65536
+CHUNK_SIZE = 1024 * 1024
+HASH_CACHE_SIZE = 1024
 
 
 def get_file_hash(filepath: Path) -> str:
-    if not filepath.exists():
-        raise FileNotFoundError(f"File not found: {filepath}")
+    """
+    Return the XXH3 digest of a file's content.
 
+    Digests are memoized on (path, mtime, size), so re-hashing an unchanged
+    file (e.g. on task retries) is a dictionary lookup. Any write to the file
+    changes its stat signature and naturally invalidates the entry.
+    """
+    try:
+        st = filepath.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}") from None
+
+    return _hash_cached(str(filepath.absolute()), st.st_mtime_ns, st.st_size)
+
+
+def clear_hash_cache() -> None:
+    """Drop all memoized digests (e.g. after files were moved or deleted)."""
+    _hash_cached.cache_clear()
+
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def _hash_cached(path: str, mtime_ns: int, size: int) -> str:  # noqa: ARG001
+    # mtime_ns and size only participate in the cache key.
+    # XXH3 is memory-bandwidth bound; read into one reusable buffer instead
+    # of allocating a new bytes object per chunk.
     h = xxhash.xxh3_64()
-    with filepath.open("rb") as f:
-        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
-            h.update(chunk)
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with Path(path).open("rb", buffering=0) as f:
+        while n := f.readinto(buffer):
+            h.update(view[:n])
 
     return h.hexdigest()
@@ -3,8 +3,11 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-# Characters that are invalid in file/directory names across platforms
-INVALID_CHARS_PATTERN = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+# Characters that are invalid in file/directory names across platforms,
+# mapped to "_" for use with str.translate
+INVALID_CHARS_TABLE = str.maketrans(
+    dict.fromkeys([*'<>:"/\\|?*', *map(chr, range(0x20))], "_")
+)
 
 # Maximum length for a single path segment (directory or filename)
 MAX_SEGMENT_LENGTH = 200
@@ -30,6 +33,19 @@ class PathTemplate:
         """
         self.pattern = pattern
 
+        # Compile the pattern once into a positional str.format string, so
+        # render() is a single C-level substitution. Literal braces are
+        # escaped and variables become {0}, {1}, ... in order of appearance.
+        self._fields: list[str] = []
+        format_parts: list[str] = []
+        for i, part in enumerate(TEMPLATE_VAR_PATTERN.split(pattern)):
+            if i % 2:
+                format_parts.append(f"{{{len(self._fields)}}}")
+                self._fields.append(part)
+            else:
+                format_parts.append(part.replace("{", "{{").replace("}", "}}"))
+        self._format = "".join(format_parts)
+
     def render(self, metadata: dict[str, str | None]) -> Path:
         """
         Render the template with metadata values.
@@ -41,16 +57,14 @@ class PathTemplate:
         Returns:
             Path object with the rendered template.
         """
-        result = self.pattern
-
-        # Replace each {variable} with its sanitized value or empty string
-        for match in TEMPLATE_VAR_PATTERN.finditer(self.pattern):
-            var_name = match.group(1)
-            value = metadata.get(var_name)
-
-            sanitized = sanitize_filename(str(value)) if value is not None else ""
-
-            result = result.replace(match.group(0), sanitized)
+        # Substitute each {variable} with its sanitized value or nothing
+        values = [
+            sanitize_filename(str(value))
+            if (value := metadata.get(name)) is not None
+            else ""
+            for name in self._fields
+        ]
+        result = self._format.format(*values)
 
         segments = [s.strip() for s in result.split("/") if s.strip()]
 
@@ -62,7 +76,7 @@ class PathTemplate:
 
 
 def sanitize_filename(filename: str) -> str:
-    sanitized = INVALID_CHARS_PATTERN.sub("_", filename)
+    sanitized = filename.translate(INVALID_CHARS_TABLE)
     sanitized = sanitized.strip(". \t\n\r")
 
     if len(sanitized) > MAX_SEGMENT_LENGTH:
@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from watchfiles import Change, DefaultFilter, awatch
 
@@ -46,10 +46,33 @@ class BookFilter(DefaultFilter):
         return p.suffix.lower() in SUPPORTED_EXTENSIONS
 
 
+def _coalesce_rename(payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Merge a lone DELETE and ADD of the same file type into one RENAME.
+
+    A rename or move reaches the watcher as a deletion of the old path and
+    an addition of the new one in the same batch. Batches with more than one
+    of either are left alone since the pairing would be a guess.
+    """
+    deletes = [p for p in payloads if p["event"] == "DELETE"]
+    adds = [p for p in payloads if p["event"] == "ADD"]
+    if len(deletes) != 1 or len(adds) != 1:
+        return payloads
+
+    old_path, new_path = deletes[0]["path"], adds[0]["path"]
+    if Path(old_path).suffix.lower() != Path(new_path).suffix.lower():
+        return payloads
+
+    rename = {"event": "RENAME", "path": new_path, "old_path": old_path}
+    return [rename if p is adds[0] else p for p in payloads if p is not deletes[0]]
+
+
 async def watch_directories(
     watch_dirs: list[Path],
     settings: Settings,
     queue: TaskQueue,
+    ready: asyncio.Event | None = None,
+    watch_filter: BookFilter | None = None,
 ) -> None:
     """
     Watch directories for file changes and enqueue jobs.
@@ -61,6 +84,8 @@ async def watch_directories(
         watch_dirs: Directories to monitor
         settings: Application settings
         queue: Job queue for enqueuing ingest tasks
+        ready: Optional event set once the directories are being watched
+        watch_filter: Filter to apply to changes, a new BookFilter by default
     """
     dirs_to_watch = []
     for watch_dir in watch_dirs:
@@ -90,16 +115,28 @@ async def watch_directories(
         directories=[str(d) for d in dirs_to_watch],
     )
 
+    changes_iter = awatch(
+        *dirs_to_watch,
+        watch_filter=watch_filter or BookFilter(),
+        debounce=WATCH_DEBOUNCE_MS,
+        force_polling=settings.WATCH_FORCE_POLLING,
+        poll_delay_ms=settings.WATCH_POLL_DELAY_MS,
+        recursive=True,
+        ignore_permission_denied=True,
+    )
+    if ready is not None:
+        # Setting this before iterating relies on a watchfiles implementation
+        # detail (checked against 1.1): the first __anext__ builds RustNotify,
+        # which registers every watch synchronously, before awatch first
+        # suspends in anyio.to_thread. Waiters only resume once this task
+        # suspends, so by then the watches are in place. If a watchfiles
+        # upgrade starts the watcher lazily in its thread, events raised right
+        # after ``ready`` could be missed again.
+        ready.set()
+
     try:
-        async for changes in awatch(
-            *dirs_to_watch,
-            watch_filter=BookFilter(),
-            debounce=WATCH_DEBOUNCE_MS,
-            force_polling=settings.WATCH_FORCE_POLLING,
-            poll_delay_ms=settings.WATCH_POLL_DELAY_MS,
-            recursive=True,
-            ignore_permission_denied=True,
-        ):
+        async for changes in changes_iter:
+            payloads: list[dict[str, Any]] = []
             for change_type, path_str in changes:
                 if change_type == Change.added:
                     event = "ADD"
@@ -116,13 +153,10 @@ async def watch_directories(
                     path=path_str,
                 )
 
-                queue.add_task(
-                    task_type=IngestTask.TASK_TYPE,
-                    payload={
-                        "event": event,
-                        "path": path_str,
-                    },
-                )
+                payloads.append({"event": event, "path": path_str})
+
+            # One transaction for everything awatch grouped into this batch
+            queue.add_tasks(IngestTask.TASK_TYPE, _coalesce_rename(payloads))
 
     except asyncio.CancelledError:
         logger.debug("File watcher cancelled")
@@ -17,6 +17,9 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 WORKER_ERROR_BACKOFF = 5.0
+# Tasks claimed per queue round-trip. Kept small so claimed tasks don't wait
+# long behind the ones ahead of them.
+WORKER_BATCH_SIZE = 4
 
 
 def _handle_task_failure(queue: TaskQueue, task: TaskModel, error_msg: str) -> None:
@@ -62,29 +65,54 @@ async def _process_task(
         _handle_task_failure(queue, task, error_msg)
 
 
-async def _wait_for_task(queue: TaskQueue, wait_timeout: float) -> TaskModel | None:
-    """Wait for a task, returning None if timeout or no task available."""
-    task = queue.fetch_next_task()
-    if task:
-        return task
+async def _process_batch(
+    batch: list[TaskModel],
+    tasks: dict[str, Task],
+    queue: TaskQueue,
+) -> None:
+    """Process claimed tasks in order, handing back any left unstarted."""
+    for index, task in enumerate(batch):
+        try:
+            queue.start_task(task)
+            await _process_task(task, tasks, queue)
+        except BaseException:
+            # Only tasks still CLAIMED are released, so including the current
+            # one is safe whether or not it was started.
+            queue.release_tasks([t.id for t in batch[index:]])
+            raise
+
+
+async def _wait_for_tasks(queue: TaskQueue, wait_timeout: float) -> list[TaskModel]:
+    """Wait for tasks, returning an empty batch if none arrive in time."""
+    # Consume the signal before checking the queue: anything enqueued after
+    # this point sets the event again, so no notification can be lost
+    # between the check and the wait.
+    queue.task_event.clear()
+
+    batch = queue.fetch_tasks(WORKER_BATCH_SIZE)
+    if batch:
+        return batch
 
     with contextlib.suppress(TimeoutError):
         await asyncio.wait_for(queue.task_event.wait(), timeout=wait_timeout)
-    queue.task_event.clear()
-    return None
+    return []
 
 
 async def worker(
     queue: TaskQueue,
     tasks: dict[str, Task],
     poll_interval: float,
+    ready: asyncio.Event | None = None,
 ) -> None:
     """Main worker loop that processes tasks from the queue.
 
     Args:
         queue: Task queue for fetching and managing tasks.
         tasks: Registry mapping task type strings to task processor instances.
-        poll_interval: Seconds to wait for new tasks before checking again.
+        poll_interval: Fallback seconds between queue checks. New and retried
+            tasks wake the worker through the queue event before this elapses.
+        ready: Optional event set once stale tasks are recovered and the
+            worker is about to start taking tasks.
     """
     from .task_queue import TASK_MAX_RETRIES
 
@@ -103,13 +131,14 @@ async def worker(
         logger.error("Failed to recover stale tasks", error=str(e))
 
     logger.info("Worker ready")
+    if ready is not None:
+        ready.set()
 
     try:
         while True:
             try:
-                task = await _wait_for_task(queue, poll_interval)
-                if task:
-                    await _process_task(task, tasks, queue)
+                batch = await _wait_for_tasks(queue, poll_interval)
+                await _process_batch(batch, tasks, queue)
 
             except asyncio.CancelledError:
                 raise
@@ -1,6 +1,8 @@
 import asyncio
 import contextlib
+import os
 import sys
+import tempfile
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass
 from pathlib import Path
@@ -27,11 +29,12 @@ pytest_plugins = [
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def pytest_configure(config: pytest.Config) -> None:
+    # Keep test databases and watched directories on tmpfs when the host has
+    # one; an explicit --basetemp still wins.
+    shm = Path("/dev/shm")
+    if config.option.basetemp is None and shm.is_dir() and os.access(shm, os.W_OK):
+        tempfile.tempdir = str(shm)
 
 
 @dataclass
@@ -54,7 +57,6 @@ async def integration_ctx(tmp_path: Path) -> AsyncGenerator[IntegrationContext]:
         CONVERT_EPUB=True,
         ORGANIZE_LIBRARY=True,
         ORGANIZE_TEMPLATE="{author}/{title}",
-        WORKER_POLL_INTERVAL=0.01,
     )
 
     test_engine = create_engine(
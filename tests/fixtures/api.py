@@ -1,8 +1,9 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 from kobold.config import Settings, get_settings
 from kobold.main import app
@@ -19,3 +20,15 @@ def client(tmp_path: Path) -> Generator[TestClient]:
         yield client
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def async_client() -> AsyncGenerator[AsyncClient]:
+    """In-process client for tests that already run a worker.
+
+    ASGITransport never sends lifespan events, so the app's own scanner and
+    worker are not started. Dependency overrides are left to the caller.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
@@ -1,20 +1,63 @@
+import contextlib
+import sqlite3
 from collections.abc import Generator
 from pathlib import Path
 from uuid import uuid4
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
 
-@pytest.fixture
-def temp_db(tmp_path: Path) -> Generator[str]:
-    db_path = tmp_path / f"test_{uuid4().hex[:8]}.db"
-    db_url = f"sqlite:///{db_path}"
+def configure_sqlite(engine: Engine) -> Engine:
+    """Apply write-friendly PRAGMAs to every connection of a test engine.
+
+    Test databases are throwaway, so WAL with synchronous=NORMAL avoids an
+    fsync per commit without giving up anything the tests rely on.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
 
-    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    return engine
+
+
+@pytest.fixture(scope="session")
+def schema_template() -> Generator[sqlite3.Connection]:
+    """In-memory database holding the empty schema, built once per session."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
     SQLModel.metadata.create_all(engine)
+    connection = engine.raw_connection()
+
+    yield connection.driver_connection
 
-    yield db_url
+    connection.close()
+    engine.dispose()
+
+
+def restore_schema(template: sqlite3.Connection, db_path: Path) -> None:
+    """Create a database file by copying the template's pages into it."""
+    with contextlib.closing(sqlite3.connect(db_path)) as target:
+        template.backup(target)
+
+
+@pytest.fixture
+def temp_db(tmp_path: Path, schema_template: sqlite3.Connection) -> Generator[str]:
+    db_path = tmp_path / f"test_{uuid4().hex[:8]}.db"
+    restore_schema(schema_template, db_path)
+
+    yield f"sqlite:///{db_path}"
 
     if db_path.exists():
         db_path.unlink()
@@ -26,3 +69,39 @@ def temp_db_session(temp_db: str) -> Generator[Session]:
 
     with Session(engine) as session:
         yield session
+
+
+@pytest.fixture(scope="session")
+def shared_engine(tmp_path_factory: pytest.TempPathFactory) -> Engine:
+    """File-backed engine whose schema is created once per test session.
+
+    StaticPool hands every Session the same connection, so assertions read
+    the worker's commits from a warm page cache. This relies on all database
+    access happening on the event loop thread, as it does in the worker.
+    """
+    db_path = tmp_path_factory.mktemp("db") / "shared.db"
+    engine = configure_sqlite(
+        create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def clean_engine(shared_engine: Engine) -> Engine:
+    """The shared engine with every table emptied before the test runs."""
+    with shared_engine.begin() as connection:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            connection.execute(table.delete())
+    return shared_engine
+
+
+@pytest.fixture
+def db_session(clean_engine: Engine) -> Generator[Session]:
+    """One Session per test for reading back rows; call expire_all() first."""
+    with Session(clean_engine) as session:
+        yield session
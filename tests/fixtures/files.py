@@ -4,11 +4,21 @@ from pathlib import Path
 import pytest
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_data_dir() -> Path:
     return Path(__file__).parents[1] / "data"
 
 
+@pytest.fixture(scope="session")
+def romeo_bytes(test_data_dir: Path) -> bytes:
+    return (test_data_dir / "romeo_and_juliet.epub").read_bytes()
+
+
+@pytest.fixture(scope="session")
+def beauty_bytes(test_data_dir: Path) -> bytes:
+    return (test_data_dir / "beauty_and_the_beast.pdf").read_bytes()
+
+
 @pytest.fixture
 def synthetic_epub(tmp_path: Path) -> Path:
     epub_path = tmp_path / "test_book.epub"
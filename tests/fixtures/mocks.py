@@ -17,7 +17,6 @@ def minimized_test_delays() -> Generator[None]:
             "os.environ",
             {
                 "KB_WATCH_POLL_DELAY_MS": "1",
-                "KB_WORKER_POLL_INTERVAL": "0.01",
             },
         ),
         patch("kobold.scheduler.RECONCILE_INTERVAL_MINUTES", 1),
@@ -72,19 +72,20 @@ async def hooks_ctx(
 
 @pytest.mark.asyncio
 async def test_embed_metadata_epub(
-    hooks_ctx: IntegrationContext, test_data_dir: Path, async_worker_task
+    hooks_ctx: IntegrationContext, romeo_bytes: bytes, async_worker_task
 ):
     ctx = hooks_ctx
 
+    watcher_ready = asyncio.Event()
     watcher_task = asyncio.create_task(
-        watch_directories([ctx.watch_dir], ctx.settings, ctx.queue)
+        watch_directories([ctx.watch_dir], ctx.settings, ctx.queue, ready=watcher_ready)
     )
-    await asyncio.sleep(0.1)
+    await watcher_ready.wait()
     worker_task = async_worker_task(ctx.settings, ctx.engine, ctx.queue)
 
     try:
         test_file = ctx.watch_dir / "embed_test.epub"
-        test_file.write_bytes((test_data_dir / "romeo_and_juliet.epub").read_bytes())
+        test_file.write_bytes(romeo_bytes)
 
         found = False
         for _ in range(50):
@@ -144,19 +145,20 @@ async def test_embed_metadata_epub(
 
 @pytest.mark.asyncio
 async def test_embed_metadata_pdf(
-    hooks_ctx: IntegrationContext, test_data_dir: Path, async_worker_task
+    hooks_ctx: IntegrationContext, beauty_bytes: bytes, async_worker_task
 ):
     ctx = hooks_ctx
 
+    watcher_ready = asyncio.Event()
     watcher_task = asyncio.create_task(
-        watch_directories([ctx.watch_dir], ctx.settings, ctx.queue)
+        watch_directories([ctx.watch_dir], ctx.settings, ctx.queue, ready=watcher_ready)
     )
-    await asyncio.sleep(0.1)
+    await watcher_ready.wait()
     worker_task = async_worker_task(ctx.settings, ctx.engine, ctx.queue)
 
     try:
         test_file = ctx.watch_dir / "embed_test.pdf"
-        test_file.write_bytes((test_data_dir / "beauty_and_the_beast.pdf").read_bytes())
+        test_file.write_bytes(beauty_bytes)
 
         found = False
         for _ in range(50):
@@ -213,21 +215,22 @@ async def test_embed_metadata_pdf(
 
 @pytest.mark.asyncio
 async def test_delete_original_after_conversion(
-    hooks_ctx: IntegrationContext, test_data_dir: Path, async_worker_task
+    hooks_ctx: IntegrationContext, romeo_bytes: bytes, async_worker_task
 ):
     ctx = hooks_ctx
 
     ctx.settings.DELETE_ORIGINAL_AFTER_CONVERSION = True
 
+    watcher_ready = asyncio.Event()
     watcher_task = asyncio.create_task(
-        watch_directories([ctx.watch_dir], ctx.settings, ctx.queue)
+        watch_directories([ctx.watch_dir], ctx.settings, ctx.queue, ready=watcher_ready)
     )
-    await asyncio.sleep(0.1)
+    await watcher_ready.wait()
     worker_task = async_worker_task(ctx.settings, ctx.engine, ctx.queue)
 
     try:
         test_file = (ctx.watch_dir / "delete_test.epub").absolute()
-        test_file.write_bytes((test_data_dir / "romeo_and_juliet.epub").read_bytes())
+        test_file.write_bytes(romeo_bytes)
 
         kepub_file = ctx.watch_dir / "delete_test.kepub.epub"
 
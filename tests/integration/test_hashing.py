@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from kobold.utils.hashing import get_file_hash
+from kobold.utils.hashing import _hash_cached, clear_hash_cache, get_file_hash
 
 
 class TestFileHash:
@@ -50,3 +50,30 @@ class TestFileHash:
 
         result = get_file_hash(empty_file)
         assert result
+
+    def test_unchanged_file_is_served_from_cache(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "cached.txt"
+        file_path.write_bytes(b"cache me" * 1000)
+
+        first = get_file_hash(file_path)
+        hits_before = _hash_cached.cache_info().hits
+        second = get_file_hash(file_path)
+
+        assert first == second
+        assert _hash_cached.cache_info().hits == hits_before + 1
+
+    def test_modified_file_is_rehashed(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "changing.txt"
+        file_path.write_bytes(b"Content A" * 1000)
+        hash1 = get_file_hash(file_path)
+
+        file_path.write_bytes(b"Content B" * 1001)
+        hash2 = get_file_hash(file_path)
+
+        assert hash1 != hash2
+
+    def test_clear_hash_cache(self, sample_text_file: Path) -> None:
+        get_file_hash(sample_text_file)
+        clear_hash_cache()
+
+        assert _hash_cached.cache_info().currsize == 0
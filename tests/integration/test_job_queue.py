@@ -1,6 +1,9 @@
+import asyncio
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from sqlalchemy import insert
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
 from kobold.models import Task as TaskModel
@@ -12,16 +15,30 @@ from kobold.tasks.metadata import MetadataTask
 
 
 class TestTaskQueue:
-    @pytest.fixture
-    def test_engine(self, tmp_path):
-        db_path = tmp_path / "test.db"
+    @pytest.fixture(scope="class")
+    def schema_engine(self):
+        # StaticPool keeps a single connection so every Session the queue
+        # opens sees the same in-memory database.
         engine = create_engine(
-            f"sqlite:///{db_path}",
+            "sqlite://",
             connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
         )
         SQLModel.metadata.create_all(engine)
         return engine
 
+    @pytest.fixture
+    def test_engine(self, schema_engine):
+        with schema_engine.begin() as connection:
+            for table in reversed(SQLModel.metadata.sorted_tables):
+                connection.execute(table.delete())
+        return schema_engine
+
+    @pytest.fixture
+    def db_session(self, test_engine):
+        with Session(test_engine) as session:
+            yield session
+
     @pytest.fixture
     def mock_settings(self):
         from unittest.mock import Mock
@@ -46,6 +63,40 @@ class TestTaskQueue:
         assert result.status == TaskStatus.PENDING
         assert result.payload["path"] == "/test/file.epub"
 
+    def test_add_tasks_commits_batch(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        added = task_queue.add_tasks(
+            IngestTask.TASK_TYPE,
+            [{"order": 1}, {"order": 2}, {"order": 3}],
+        )
+
+        assert [t.payload["order"] for t in added] == [1, 2, 3]
+        assert task_queue.get_queue_stats()["PENDING"] == 3
+        assert task_queue.task_event.is_set()
+
+    def test_add_tasks_empty_batch(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        assert task_queue.add_tasks(IngestTask.TASK_TYPE, []) == []
+        assert not task_queue.task_event.is_set()
+
+    def test_add_task_reports_enqueued_task(
+        self,
+        test_engine,
+        mock_settings,
+    ) -> None:
+        enqueued: list[TaskModel] = []
+        task_queue = TaskQueue(
+            mock_settings, test_engine, on_task_enqueued=enqueued.append
+        )
+
+        result = task_queue.add_task(IngestTask.TASK_TYPE, payload={"path": "/a"})
+
+        assert enqueued == [result]
+
     def test_fetch_next_task_empty_queue(
         self,
         task_queue: TaskQueue,
@@ -82,10 +133,94 @@ class TestTaskQueue:
         assert fetched.status == TaskStatus.PROCESSING
         assert fetched.started_at is not None
 
+    def test_fetch_next_task_does_not_reclaim_processing_task(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        task_queue.add_task(MetadataTask.TASK_TYPE, payload={})
+
+        assert task_queue.fetch_next_task() is not None
+        assert task_queue.fetch_next_task() is None
+
+    def test_fetch_tasks_claims_batch_in_order(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        task_queue.add_tasks(
+            IngestTask.TASK_TYPE,
+            [{"order": 1}, {"order": 2}, {"order": 3}],
+        )
+
+        batch = task_queue.fetch_tasks(2)
+
+        assert [t.payload["order"] for t in batch] == [1, 2]
+        assert all(t.status == TaskStatus.CLAIMED for t in batch)
+        assert all(t.started_at is None for t in batch)
+        stats = task_queue.get_queue_stats()
+        assert (stats["PENDING"], stats["CLAIMED"], stats["PROCESSING"]) == (1, 2, 0)
+
+    def test_start_task_marks_claimed_task_processing(
+        self,
+        task_queue: TaskQueue,
+        db_session,
+    ) -> None:
+        task_queue.add_task(IngestTask.TASK_TYPE, payload={})
+        (claimed,) = task_queue.fetch_tasks(1)
+
+        task_queue.start_task(claimed)
+
+        assert claimed.status == TaskStatus.PROCESSING
+        db_session.expire_all()
+        started = db_session.get(TaskModel, claimed.id)
+        assert started is not None
+        assert started.status == TaskStatus.PROCESSING
+        assert started.started_at is not None
+
+    def test_release_tasks_returns_them_to_queue(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        task_queue.add_tasks(IngestTask.TASK_TYPE, [{"order": 1}, {"order": 2}])
+        batch = task_queue.fetch_tasks(2)
+        task_queue.start_task(batch[0])
+
+        # The started task is left alone
+        task_queue.release_tasks([t.id for t in batch])
+
+        released = task_queue.fetch_next_task()
+        assert released is not None
+        assert released.payload["order"] == 2
+        assert task_queue.get_queue_stats()["PROCESSING"] == 2
+
+    def test_recover_releases_claims_from_crashed_batch(
+        self,
+        task_queue: TaskQueue,
+        db_session,
+    ) -> None:
+        task_queue.add_tasks(
+            IngestTask.TASK_TYPE, [{"order": 1}, {"order": 2}, {"order": 3}]
+        )
+        batch = task_queue.fetch_tasks(3)
+        task_queue.start_task(batch[0])
+
+        # The process dies here; the next startup recovers the queue
+        assert task_queue.recover_stale_tasks() == 2
+
+        db_session.expire_all()
+        started = db_session.get(TaskModel, batch[0].id)
+        assert started is not None
+        assert started.status == TaskStatus.PROCESSING
+        for task in batch[1:]:
+            unstarted = db_session.get(TaskModel, task.id)
+            assert unstarted is not None
+            assert unstarted.status == TaskStatus.PENDING
+            assert unstarted.retry_count == 0
+            assert unstarted.error_message is None
+
     def test_complete_task_success(
         self,
         task_queue: TaskQueue,
-        test_engine,
+        db_session,
     ) -> None:
         task_queue.add_task(ConvertTask.TASK_TYPE, payload={})
         fetched = task_queue.fetch_next_task()
@@ -93,16 +228,16 @@ class TestTaskQueue:
 
         task_queue.complete_task(fetched.id)
 
-        with Session(test_engine) as session:
-            completed = session.get(TaskModel, fetched.id)
-            assert completed is not None
-            assert completed.status == TaskStatus.COMPLETED
-            assert completed.completed_at is not None
+        db_session.expire_all()
+        completed = db_session.get(TaskModel, fetched.id)
+        assert completed is not None
+        assert completed.status == TaskStatus.COMPLETED
+        assert completed.completed_at is not None
 
     def test_complete_task_with_error(
         self,
         task_queue: TaskQueue,
-        test_engine,
+        db_session,
     ) -> None:
         task_queue.add_task(IngestTask.TASK_TYPE, payload={})
         fetched = task_queue.fetch_next_task()
@@ -110,16 +245,16 @@ class TestTaskQueue:
 
         task_queue.complete_task(fetched.id, error="Something went wrong")
 
-        with Session(test_engine) as session:
-            failed = session.get(TaskModel, fetched.id)
-            assert failed is not None
-            assert failed.status == TaskStatus.FAILED
-            assert failed.error_message == "Something went wrong"
+        db_session.expire_all()
+        failed = db_session.get(TaskModel, fetched.id)
+        assert failed is not None
+        assert failed.status == TaskStatus.FAILED
+        assert failed.error_message == "Something went wrong"
 
     def test_retry_task(
         self,
         task_queue: TaskQueue,
-        test_engine,
+        db_session,
     ) -> None:
         task_queue.add_task(MetadataTask.TASK_TYPE, payload={})
         fetched = task_queue.fetch_next_task()
@@ -127,30 +262,36 @@ class TestTaskQueue:
 
         task_queue.retry_task(fetched.id, "Temporary error")
 
-        with Session(test_engine) as session:
-            retried = session.get(TaskModel, fetched.id)
-            assert retried is not None
-            assert retried.status == TaskStatus.PENDING
-            assert retried.retry_count == 1
-            assert retried.next_retry_at is not None
-            assert retried.error_message == "Temporary error"
+        db_session.expire_all()
+        retried = db_session.get(TaskModel, fetched.id)
+        assert retried is not None
+        assert retried.status == TaskStatus.PENDING
+        assert retried.retry_count == 1
+        assert retried.next_retry_at is not None
+        assert retried.error_message == "Temporary error"
 
     def test_recover_stale_tasks(
         self,
         task_queue: TaskQueue,
-        test_engine,
+        db_session,
         mock_settings,
     ) -> None:
-        with Session(test_engine) as session:
-            stale_job = TaskModel(
-                type=IngestTask.TASK_TYPE,
-                payload={"path": "/stale"},
-                status=TaskStatus.PROCESSING,
-                started_at=datetime.now(UTC) - timedelta(hours=2),
-            )
-            session.add(stale_job)
-            session.commit()
-            stale_id = stale_job.id
+        stale_job = TaskModel(
+            type=IngestTask.TASK_TYPE,
+            payload={"path": "/stale"},
+            status=TaskStatus.PROCESSING,
+            started_at=datetime.now(UTC) - timedelta(hours=2),
+        )
+        active_job = TaskModel(
+            type=IngestTask.TASK_TYPE,
+            payload={"path": "/active"},
+            status=TaskStatus.PROCESSING,
+            started_at=datetime.now(UTC),
+        )
+        db_session.add_all([stale_job, active_job])
+        db_session.commit()
+        stale_id = stale_job.id
+        active_id = active_job.id
 
         mock_settings.JOB_STALE_MINUTES = 30
         mock_settings.JOB_MAX_RETRIES = 3
@@ -159,10 +300,46 @@ class TestTaskQueue:
 
         assert recovered == 1
 
-        with Session(test_engine) as session:
-            job = session.get(TaskModel, stale_id)
-            assert job is not None
-            assert job.status == TaskStatus.PENDING
+        db_session.expire_all()
+        job = db_session.get(TaskModel, stale_id)
+        assert job is not None
+        assert job.status == TaskStatus.PENDING
+        assert job.started_at is None
+        assert job.retry_count == 1
+        assert job.error_message == "Task recovered from stale state"
+
+        active = db_session.get(TaskModel, active_id)
+        assert active is not None
+        assert active.status == TaskStatus.PROCESSING
+
+    def test_recover_stale_tasks_in_bulk(
+        self,
+        task_queue: TaskQueue,
+        db_session,
+    ) -> None:
+        from uuid import uuid4
+
+        started_at = datetime.now(UTC) - timedelta(hours=2)
+        db_session.connection().execute(
+            insert(TaskModel),
+            [
+                {
+                    "id": uuid4(),
+                    "type": IngestTask.TASK_TYPE,
+                    "payload": {"path": f"/stale/{i}"},
+                    "status": TaskStatus.PROCESSING,
+                    "created_at": started_at,
+                    "started_at": started_at,
+                    "retry_count": 0,
+                    "max_retries": 3,
+                }
+                for i in range(100)
+            ],
+        )
+        db_session.commit()
+
+        assert task_queue.recover_stale_tasks() == 100
+        assert task_queue.get_queue_stats()["PENDING"] == 100
 
     def test_complete_unknown_job_handles_gracefully(
         self,
@@ -202,6 +379,14 @@ class TestTaskQueue:
         assert stats["COMPLETED"] == 1
         assert stats["PROCESSING"] == 0
 
+    def test_get_queue_stats_empty_queue(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        stats = task_queue.get_queue_stats()
+
+        assert stats == {status.value: 0 for status in TaskStatus}
+
     def test_task_event_is_set_when_job_added(
         self,
         task_queue: TaskQueue,
@@ -226,3 +411,59 @@ class TestTaskQueue:
 
         task_queue.add_task(MetadataTask.TASK_TYPE, payload={"book_id": "123"})
         assert task_queue.task_event.is_set()
+
+    async def test_retry_task_wakes_worker_when_due(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        """A retried task signals the event once its delay has elapsed."""
+        task_queue.add_task(MetadataTask.TASK_TYPE, payload={})
+        fetched = task_queue.fetch_next_task()
+        assert fetched is not None
+        task_queue.task_event.clear()
+
+        task_queue.retry_task(fetched.id, "Temporary error", delay_seconds=0)
+        assert not task_queue.task_event.is_set()
+
+        await asyncio.wait_for(task_queue.task_event.wait(), timeout=1.0)
+
+    def test_retry_task_outside_event_loop(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        task_queue.add_task(MetadataTask.TASK_TYPE, payload={})
+        fetched = task_queue.fetch_next_task()
+        assert fetched is not None
+
+        # Should not raise without a running loop
+        task_queue.retry_task(fetched.id, "Temporary error")
+
+    def test_idle_event_tracks_active_tasks(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        assert task_queue.idle_event.is_set()
+
+        task_queue.add_task(IngestTask.TASK_TYPE, payload={})
+        assert not task_queue.idle_event.is_set()
+
+        fetched = task_queue.fetch_next_task()
+        assert fetched is not None
+        task_queue.complete_task(fetched.id)
+
+        assert task_queue.idle_event.is_set()
+
+    def test_idle_event_not_set_while_tasks_remain(
+        self,
+        task_queue: TaskQueue,
+    ) -> None:
+        task_queue.add_task(IngestTask.TASK_TYPE, payload={"order": 1})
+        task_queue.add_task(IngestTask.TASK_TYPE, payload={"order": 2})
+        assert not task_queue.idle_event.is_set()
+
+        fetched = task_queue.fetch_next_task()
+        assert fetched is not None
+        task_queue.complete_task(fetched.id)
+
+        assert not task_queue.idle_event.is_set()
+        assert task_queue.has_active_tasks()
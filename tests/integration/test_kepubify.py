@@ -1,5 +1,5 @@
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -31,12 +31,17 @@ class TestKepubifyBinaryFilesystem:
     async def test_ensure_downloads_and_returns_path_when_not_found(
         self, kepubify_binary: KepubifyBinary
     ) -> None:
+        content = b"binary content" * 1024
+
+        async def aiter_bytes(chunk_size: int | None = None):
+            for i in range(0, len(content), 4096):
+                yield content[i : i + 4096]
+
         mock_response = MagicMock()
-        mock_response.content = b"binary content"
-        mock_response.raise_for_status = MagicMock()
+        mock_response.aiter_bytes = aiter_bytes
 
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
+        mock_client = MagicMock()
+        mock_client.stream.return_value.__aenter__.return_value = mock_response
 
         with (
             patch("shutil.which", return_value=None),
@@ -48,5 +53,6 @@ class TestKepubifyBinaryFilesystem:
             result = await kepubify_binary.ensure()
 
         assert result is not None
-        assert Path(result).exists()
-        mock_client.get.assert_called_once()
+        assert Path(result).read_bytes() == content
+        assert not list(kepubify_binary.bin_dir.glob("*.part"))
+        mock_client.stream.assert_called_once()
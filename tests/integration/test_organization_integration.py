@@ -1,46 +1,41 @@
 import asyncio
 import contextlib
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
-from sqlmodel import Session, SQLModel, col, create_engine, select
+from sqlmodel import col, select
 
 from kobold.config import Settings
-from kobold.models import Book, TaskStatus
-from kobold.models import Task as TaskModel
+from kobold.models import Book
 from kobold.scanner import ScannerService
 from kobold.task_queue import TaskQueue
 from kobold.task_registry import create_tasks
 from kobold.worker import worker
 
+# Built once; SQLAlchemy reuses the compiled form from its statement cache
+ROMEO_BOOK = select(Book).where(col(Book.title).contains("Romeo"))
 
-async def wait_for_tasks(engine, timeout_sec: float = 5.0) -> None:
-    try:
-        async with asyncio.timeout(timeout_sec):
-            while True:
-                with Session(engine) as session:
-                    pending = session.exec(
-                        select(TaskModel).where(
-                            col(TaskModel.status).in_(
-                                [TaskStatus.PENDING, TaskStatus.PROCESSING]
-                            )
-                        )
-                    ).all()
-                    if not pending:
-                        return
-                await asyncio.sleep(0.05)
-    except TimeoutError:
-        pass
+
+async def wait_for_tasks(queue: TaskQueue, timeout_sec: float = 5.0) -> None:
+    with contextlib.suppress(TimeoutError):
+        await asyncio.wait_for(queue.idle_event.wait(), timeout_sec)
 
 
 @contextlib.asynccontextmanager
 async def run_worker(ctx):
     handlers = create_tasks(ctx["settings"], ctx["engine"], ctx["queue"])
+    worker_ready = asyncio.Event()
     worker_task = asyncio.create_task(
-        worker(ctx["queue"], handlers, ctx["settings"].WORKER_POLL_INTERVAL)
+        worker(
+            ctx["queue"],
+            handlers,
+            ctx["settings"].WORKER_POLL_INTERVAL,
+            ready=worker_ready,
+        )
     )
 
-    await asyncio.sleep(0.05)
+    await worker_ready.wait()
 
     try:
         yield
@@ -51,14 +46,10 @@ async def run_worker(ctx):
 
 
 @pytest.fixture
-async def organize_ctx(tmp_path: Path, mock_kepub_converter):
+async def organize_ctx(tmp_path: Path, clean_engine, mock_kepub_converter):
     watch_dir = tmp_path / "books"
     watch_dir.mkdir()
 
-    db_path = tmp_path / "test_org.db"
-    test_engine = create_engine(f"sqlite:///{db_path}")
-    SQLModel.metadata.create_all(test_engine)
-
     test_settings = Settings(
         DATA_PATH=tmp_path,
         WATCH_DIRS=str(watch_dir),
@@ -67,28 +58,23 @@ async def organize_ctx(tmp_path: Path, mock_kepub_converter):
         ORGANIZE_LIBRARY=True,
         ORGANIZE_TEMPLATE="{author}/{title}",
         FETCH_EXTERNAL_METADATA=False,
-        WORKER_POLL_INTERVAL=0.01,
     )
 
-    test_queue = TaskQueue(test_settings, test_engine)
+    test_queue = TaskQueue(test_settings, clean_engine)
 
     yield {
         "watch_dir": watch_dir,
         "settings": test_settings,
-        "engine": test_engine,
+        "engine": clean_engine,
         "queue": test_queue,
     }
 
 
 @pytest.fixture
-async def organize_ctx_with_series(tmp_path: Path, mock_kepub_converter):
+async def organize_ctx_with_series(tmp_path: Path, clean_engine, mock_kepub_converter):
     watch_dir = tmp_path / "books"
     watch_dir.mkdir()
 
-    db_path = tmp_path / "test_org_series.db"
-    test_engine = create_engine(f"sqlite:///{db_path}")
-    SQLModel.metadata.create_all(test_engine)
-
     test_settings = Settings(
         DATA_PATH=tmp_path,
         WATCH_DIRS=str(watch_dir),
@@ -97,15 +83,14 @@ async def organize_ctx_with_series(tmp_path: Path, mock_kepub_converter):
         ORGANIZE_LIBRARY=True,
         ORGANIZE_TEMPLATE="{author}/{series}/{title}",
         FETCH_EXTERNAL_METADATA=False,
-        WORKER_POLL_INTERVAL=0.01,
     )
 
-    test_queue = TaskQueue(test_settings, test_engine)
+    test_queue = TaskQueue(test_settings, clean_engine)
 
     yield {
         "watch_dir": watch_dir,
         "settings": test_settings,
-        "engine": test_engine,
+        "engine": clean_engine,
         "queue": test_queue,
     }
 
@@ -113,90 +98,86 @@ async def organize_ctx_with_series(tmp_path: Path, mock_kepub_converter):
 class TestOrganizationHappyPath:
     @pytest.mark.asyncio
     async def test_organization_moves_file_after_ingest(
-        self, organize_ctx, test_data_dir: Path
+        self, organize_ctx, db_session, romeo_bytes: bytes
     ):
         ctx = organize_ctx
 
-        source_epub = test_data_dir / "romeo_and_juliet.epub"
         book_path = ctx["watch_dir"] / "romeo.epub"
-        book_path.write_bytes(source_epub.read_bytes())
+        book_path.write_bytes(romeo_bytes)
 
         scanner = ScannerService(settings=ctx["settings"], queue=ctx["queue"])
         await scanner.scan_directories()
 
         async with run_worker(ctx):
-            await wait_for_tasks(ctx["engine"])
+            await wait_for_tasks(ctx["queue"])
 
-        with Session(ctx["engine"]) as session:
-            book = session.exec(
-                select(Book).where(col(Book.title).contains("Romeo"))
-            ).first()
+        db_session.expire_all()
+        book = db_session.exec(ROMEO_BOOK).first()
 
-            assert book, "Book not found in database"
-            new_path = Path(book.file_path)
-            assert "Shakespeare" in str(new_path) or "Unknown" in str(new_path)
-            assert "Romeo" in str(new_path)
-            assert new_path.exists()
+        assert book, "Book not found in database"
+        new_path = Path(book.file_path)
+        assert "Shakespeare" in str(new_path) or "Unknown" in str(new_path)
+        assert "Romeo" in str(new_path)
+        assert new_path.exists()
 
     @pytest.mark.asyncio
     async def test_organization_with_series_template(
-        self, organize_ctx_with_series, test_data_dir: Path
+        self, organize_ctx_with_series, db_session, romeo_bytes: bytes
     ):
         ctx = organize_ctx_with_series
 
-        source_epub = test_data_dir / "romeo_and_juliet.epub"
         book_path = ctx["watch_dir"] / "romeo_series.epub"
-        book_path.write_bytes(source_epub.read_bytes())
+        book_path.write_bytes(romeo_bytes)
 
         scanner = ScannerService(settings=ctx["settings"], queue=ctx["queue"])
         await scanner.scan_directories()
 
         async with run_worker(ctx):
-            await wait_for_tasks(ctx["engine"])
+            await wait_for_tasks(ctx["queue"])
 
-        with Session(ctx["engine"]) as session:
-            book = session.exec(
-                select(Book).where(col(Book.title).contains("Romeo"))
-            ).first()
+        db_session.expire_all()
+        book = db_session.exec(ROMEO_BOOK).first()
 
-            if book:
-                new_path = Path(book.file_path)
-                assert new_path.exists()
+        if book:
+            new_path = Path(book.file_path)
+            assert new_path.exists()
 
     @pytest.mark.asyncio
-    async def test_organization_pdf_file(self, organize_ctx, test_data_dir: Path):
+    async def test_organization_pdf_file(
+        self, organize_ctx, db_session, beauty_bytes: bytes
+    ):
         ctx = organize_ctx
 
-        source_pdf = test_data_dir / "beauty_and_the_beast.pdf"
         book_path = ctx["watch_dir"] / "beauty.pdf"
-        book_path.write_bytes(source_pdf.read_bytes())
+        book_path.write_bytes(beauty_bytes)
 
         scanner = ScannerService(settings=ctx["settings"], queue=ctx["queue"])
         await scanner.scan_directories()
 
         async with run_worker(ctx):
-            await wait_for_tasks(ctx["engine"])
+            await wait_for_tasks(ctx["queue"])
 
-        with Session(ctx["engine"]) as session:
-            book = session.exec(select(Book).where(Book.file_format == "pdf")).first()
+        db_session.expire_all()
+        book = db_session.exec(select(Book).where(Book.file_format == "pdf")).first()
 
-            if book:
-                new_path = Path(book.file_path)
-                assert new_path.exists()
+        if book:
+            new_path = Path(book.file_path)
+            assert new_path.exists()
 
 
 class TestOrganizationEdgeCases:
     @pytest.mark.asyncio
     async def test_organization_disabled(
-        self, tmp_path: Path, test_data_dir: Path, mock_kepub_converter
+        self,
+        tmp_path: Path,
+        romeo_bytes: bytes,
+        clean_engine,
+        db_session,
+        mock_kepub_converter,
     ):
         watch_dir = tmp_path / "books"
         watch_dir.mkdir()
 
-        db_path = tmp_path / "test_no_org.db"
-        test_engine = create_engine(f"sqlite:///{db_path}")
-        SQLModel.metadata.create_all(test_engine)
-
         test_settings = Settings(
             DATA_PATH=tmp_path,
             WATCH_DIRS=str(watch_dir),
@@ -204,93 +185,82 @@ class TestOrganizationEdgeCases:
             CONVERT_EPUB=False,
             ORGANIZE_LIBRARY=False,
             FETCH_EXTERNAL_METADATA=False,
-            WORKER_POLL_INTERVAL=0.01,
         )
 
-        test_queue = TaskQueue(test_settings, test_engine)
+        test_queue = TaskQueue(test_settings, clean_engine)
 
         ctx = {
             "watch_dir": watch_dir,
             "settings": test_settings,
-            "engine": test_engine,
+            "engine": clean_engine,
             "queue": test_queue,
         }
 
-        source_epub = test_data_dir / "romeo_and_juliet.epub"
         book_path = watch_dir / "romeo_no_org.epub"
-        book_path.write_bytes(source_epub.read_bytes())
+        book_path.write_bytes(romeo_bytes)
 
         scanner = ScannerService(settings=test_settings, queue=test_queue)
         await scanner.scan_directories()
 
         async with run_worker(ctx):
-            await wait_for_tasks(test_engine)
+            await wait_for_tasks(test_queue)
 
-        with Session(test_engine) as session:
-            book = session.exec(
-                select(Book).where(col(Book.title).contains("Romeo"))
-            ).first()
+        db_session.expire_all()
+        book = db_session.exec(ROMEO_BOOK).first()
 
-            assert book, "Book not found"
-            assert book.file_path == str(book_path)
+        assert book, "Book not found"
+        assert book.file_path == str(book_path)
 
     @pytest.mark.asyncio
     async def test_organization_handles_special_characters(
-        self, organize_ctx, test_data_dir: Path
+        self, organize_ctx, db_session, romeo_bytes: bytes
     ):
         ctx = organize_ctx
 
-        source_epub = test_data_dir / "romeo_and_juliet.epub"
         book_path = ctx["watch_dir"] / "special_chars.epub"
-        book_path.write_bytes(source_epub.read_bytes())
+        book_path.write_bytes(romeo_bytes)
 
         scanner = ScannerService(settings=ctx["settings"], queue=ctx["queue"])
         await scanner.scan_directories()
 
         async with run_worker(ctx):
-            await wait_for_tasks(ctx["engine"])
+            await wait_for_tasks(ctx["queue"])
 
-        with Session(ctx["engine"]) as session:
-            book = session.exec(
-                select(Book).where(col(Book.title).contains("Romeo"))
-            ).first()
+        db_session.expire_all()
+        book = db_session.exec(ROMEO_BOOK).first()
 
-            if book:
-                new_path = Path(book.file_path)
-                path_str = str(new_path)
-                invalid_chars = '<>:"|?*'
-                for char in invalid_chars:
-                    assert char not in path_str
-                assert new_path.exists()
+        if book:
+            new_path = Path(book.file_path)
+            path_str = str(new_path)
+            invalid_chars = '<>:"|?*'
+            for char in invalid_chars:
+                assert char not in path_str
+            assert new_path.exists()
 
 
 class TestOrganizationCollisionHandling:
     @pytest.mark.asyncio
     async def test_organization_handles_duplicate_filename(
-        self, organize_ctx, test_data_dir: Path
+        self, organize_ctx, db_session, romeo_bytes: bytes
     ):
         ctx = organize_ctx
 
-        source_epub = test_data_dir / "romeo_and_juliet.epub"
-
         book_path1 = ctx["watch_dir"] / "romeo1.epub"
-        book_path1.write_bytes(source_epub.read_bytes())
+        book_path1.write_bytes(romeo_bytes)
 
         book_path2 = ctx["watch_dir"] / "romeo2.epub"
-        book_path2.write_bytes(source_epub.read_bytes())
+        book_path2.write_bytes(romeo_bytes)
 
         scanner = ScannerService(settings=ctx["settings"], queue=ctx["queue"])
         await scanner.scan_directories()
 
         async with run_worker(ctx):
-            await wait_for_tasks(ctx["engine"])
+            await wait_for_tasks(ctx["queue"])
 
-        with Session(ctx["engine"]) as session:
-            books = session.exec(
-                select(Book).where(col(Book.title).contains("Romeo"))
-            ).all()
+        db_session.expire_all()
+        books = db_session.exec(ROMEO_BOOK).all()
 
-            assert len(books) >= 1
+        assert len(books) >= 1
 
 
 class TestLibraryOrganizerFilesystem:
@@ -311,21 +281,23 @@ class TestLibraryOrganizerFilesystem:
         return LibraryOrganizer(mock_settings)
 
     @pytest.fixture
-    def mock_book(self, tmp_path):
-        from unittest.mock import Mock
-
-        book = Mock(spec=Book)
-        book.id = "123"
-        book.title = "Test Book"
-        book.author = "Test Author"
-        book.series = None
-        book.series_index = None
-        book.language = "en"
-        book.genre = "Fiction"
-        book.publication_date = None
-        book.kepub_path = None
-        book.file_hash = "test_hash"
-        return book
+    def mock_book(self):
+        # The organizer only reads and assigns plain attributes, so a
+        # namespace stands in for Book without Mock's spec introspection.
+        return SimpleNamespace(
+            id="123",
+            title="Test Book",
+            author="Test Author",
+            series=None,
+            series_index=None,
+            language="en",
+            genre="Fiction",
+            publication_date=None,
+            file_path=None,
+            kepub_path=None,
+            file_hash="test_hash",
+            file_size=None,
+        )
 
     def test_organize_moves_kepub_file(self, mock_book, organizer, tmp_path):
         main_file = tmp_path / "incoming" / "test.epub"
@@ -6,19 +6,23 @@ file events and enqueues tasks appropriately.
 
 import asyncio
 import contextlib
+import sqlite3
 from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 from typing import Any
 
 import pytest
 from sqlalchemy import create_engine
-from sqlmodel import Session, SQLModel, select
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, delete, select
+from tests.fixtures.database import configure_sqlite, restore_schema
+from watchfiles import Change
 
 from kobold.config import Settings
 from kobold.models import Task
 from kobold.task_queue import TaskQueue
 from kobold.tasks.ingest import IngestTask
-from kobold.watcher import watch_directories
+from kobold.watcher import BookFilter, watch_directories
 
 
 @pytest.fixture
@@ -29,10 +33,18 @@ def watch_dir(tmp_path: Path) -> Path:
 
 
 @pytest.fixture
-def test_db_engine(tmp_path: Path) -> Generator[Any]:
+def test_db_engine(
+    tmp_path: Path, schema_template: sqlite3.Connection
+) -> Generator[Any]:
     db_path = tmp_path / "test.db"
-    engine = create_engine(f"sqlite:///{db_path}")
-    SQLModel.metadata.create_all(engine)
+    restore_schema(schema_template, db_path)
+    engine = configure_sqlite(
+        create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    )
     yield engine
 
 
@@ -42,8 +54,43 @@ def test_settings() -> Settings:
 
 
 @pytest.fixture
-def test_queue(test_settings: Settings, test_db_engine: Any) -> TaskQueue:
-    return TaskQueue(test_settings, test_db_engine)
+def db_session(test_db_engine: Any) -> Generator[Session]:
+    """One Session per test for clearing and reading back tasks."""
+    with Session(test_db_engine, autoflush=False) as session:
+        yield session
+
+
+@pytest.fixture
+def enqueued() -> asyncio.Queue[Task]:
+    return asyncio.Queue()
+
+
+@pytest.fixture
+def test_queue(
+    test_settings: Settings, test_db_engine: Any, enqueued: asyncio.Queue[Task]
+) -> TaskQueue:
+    return TaskQueue(
+        test_settings, test_db_engine, on_task_enqueued=enqueued.put_nowait
+    )
+
+
+class SignallingBookFilter(BookFilter):
+    """BookFilter that sets an event whenever it drops a change."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rejected = asyncio.Event()
+
+    def __call__(self, change: Change, path: str) -> bool:
+        accepted = super().__call__(change, path)
+        if not accepted:
+            self.rejected.set()
+        return accepted
+
+
+@pytest.fixture
+def book_filter() -> SignallingBookFilter:
+    return SignallingBookFilter()
 
 
 @pytest.fixture
@@ -51,13 +98,20 @@ async def watcher_lifecycle(
     watch_dir: Path,
     test_settings: Settings,
     test_queue: TaskQueue,
+    book_filter: SignallingBookFilter,
 ) -> AsyncGenerator[asyncio.Task[None]]:
     """Start a watcher task and clean it up after test."""
+    ready = asyncio.Event()
     watcher_task = asyncio.create_task(
-        watch_directories([watch_dir], test_settings, test_queue)
+        watch_directories(
+            [watch_dir],
+            test_settings,
+            test_queue,
+            ready=ready,
+            watch_filter=book_filter,
+        )
     )
-    # Give watcher time to start
-    await asyncio.sleep(0.1)
+    await ready.wait()
 
     yield watcher_task
 
@@ -67,35 +121,37 @@ async def watcher_lifecycle(
 
 
 async def wait_for_task(
-    engine: Any, event_type: str, path: str, max_wait: float = 3.0
+    enqueued: asyncio.Queue[Task], event_type: str, path: str, max_wait: float = 5.0
 ) -> Task | None:
-    """Poll database for a task matching the event and path."""
-    start_time = asyncio.get_event_loop().time()
-    while asyncio.get_event_loop().time() - start_time < max_wait:
-        with Session(engine) as session:
-            tasks = session.exec(select(Task)).all()
-            for task in tasks:
+    """Wait for the queue to report a task matching the event and path.
+
+    Returns as soon as the task arrives, so the timeout is only a ceiling for
+    failing tests. It leaves room for the watcher's debounce window and for
+    slow event delivery on shared CI runners; polling-mode tests pass a
+    longer one.
+    """
+    with contextlib.suppress(TimeoutError):
+        async with asyncio.timeout(max_wait):
+            while True:
+                task = await enqueued.get()
                 if (
                     task.payload.get("event") == event_type
                     and task.payload.get("path") == path
                 ):
                     return task
-        await asyncio.sleep(0.05)
     return None
 
 
-async def clear_tasks(engine: Any) -> None:
+async def clear_tasks(session: Session) -> None:
     """Clear all tasks from database."""
-    with Session(engine) as session:
-        for t in session.exec(select(Task)).all():
-            session.delete(t)
-        session.commit()
+    session.execute(delete(Task))
+    session.commit()
 
 
 @pytest.mark.integration
 async def test_watcher_detects_file_creation(
     watch_dir: Path,
-    test_db_engine: Any,
+    enqueued: asyncio.Queue[Task],
     watcher_lifecycle: asyncio.Task[None],
 ) -> None:
     """Test that watcher detects new file creation."""
@@ -103,7 +159,7 @@ async def test_watcher_detects_file_creation(
     book_path.touch()
 
     path_str = str(book_path.absolute())
-    task = await wait_for_task(test_db_engine, "ADD", path_str)
+    task = await wait_for_task(enqueued, "ADD", path_str)
 
     assert task is not None
     assert task.type == IngestTask.TASK_TYPE
@@ -114,7 +170,8 @@ async def test_watcher_detects_file_creation(
 @pytest.mark.integration
 async def test_watcher_detects_file_deletion(
     watch_dir: Path,
-    test_db_engine: Any,
+    db_session: Session,
+    enqueued: asyncio.Queue[Task],
     watcher_lifecycle: asyncio.Task[None],
 ) -> None:
     """Test that watcher detects file deletion."""
@@ -122,12 +179,12 @@ async def test_watcher_detects_file_deletion(
     book_path.touch()
 
     path_str = str(book_path.absolute())
-    await wait_for_task(test_db_engine, "ADD", path_str)
-    await clear_tasks(test_db_engine)
+    await wait_for_task(enqueued, "ADD", path_str)
+    await clear_tasks(db_session)
 
     book_path.unlink()
 
-    delete_task = await wait_for_task(test_db_engine, "DELETE", path_str)
+    delete_task = await wait_for_task(enqueued, "DELETE", path_str)
     assert delete_task is not None
     assert delete_task.type == IngestTask.TASK_TYPE
     assert delete_task.payload["event"] == "DELETE"
@@ -136,62 +193,66 @@ async def test_watcher_detects_file_deletion(
 @pytest.mark.integration
 async def test_watcher_detects_file_rename(
     watch_dir: Path,
-    test_db_engine: Any,
+    enqueued: asyncio.Queue[Task],
     watcher_lifecycle: asyncio.Task[None],
 ) -> None:
-    """Test that watcher detects file rename."""
+    """Test that a rename is enqueued as a single RENAME task."""
     original = watch_dir / "original.epub"
     renamed = watch_dir / "renamed.epub"
 
     original.touch()
-    await wait_for_task(test_db_engine, "ADD", str(original.absolute()))
-    await clear_tasks(test_db_engine)
+    await wait_for_task(enqueued, "ADD", str(original.absolute()))
 
     original.rename(renamed)
 
     renamed_str = str(renamed.absolute())
-    add_task = await wait_for_task(test_db_engine, "ADD", renamed_str)
-    assert add_task is not None
-    assert add_task.payload["path"] == renamed_str
+    rename_task = await wait_for_task(enqueued, "RENAME", renamed_str)
+    assert rename_task is not None
+    assert rename_task.payload["old_path"] == str(original.absolute())
+    assert enqueued.empty()
 
 
 @pytest.mark.integration
 async def test_watcher_ignores_unsupported_files(
     watch_dir: Path,
-    test_db_engine: Any,
+    db_session: Session,
+    enqueued: asyncio.Queue[Task],
+    book_filter: SignallingBookFilter,
     watcher_lifecycle: asyncio.Task[None],
 ) -> None:
     """Test that watcher ignores non-ebook files."""
     txt_path = watch_dir / "notes.txt"
     txt_path.touch()
 
-    await asyncio.sleep(0.3)
+    await asyncio.wait_for(book_filter.rejected.wait(), timeout=1.0)
 
-    with Session(test_db_engine) as session:
-        tasks = session.exec(select(Task)).all()
-        assert len(tasks) == 0
+    assert enqueued.empty()
+    db_session.expire_all()
+    tasks = db_session.exec(select(Task)).all()
+    assert len(tasks) == 0
 
 
 @pytest.mark.integration
 async def test_watcher_polling_mode(
     watch_dir: Path,
-    test_db_engine: Any,
+    enqueued: asyncio.Queue[Task],
     test_queue: TaskQueue,
 ) -> None:
     """Test that polling mode works for network shares."""
     polling_settings = Settings(WATCH_FORCE_POLLING=True, USER_TOKEN="test_token")
 
+    ready = asyncio.Event()
     watcher_task = asyncio.create_task(
-        watch_directories([watch_dir], polling_settings, test_queue)
+        watch_directories([watch_dir], polling_settings, test_queue, ready=ready)
     )
-    await asyncio.sleep(0.2)
+    await ready.wait()
 
     try:
         book_path = watch_dir / "polling_test.epub"
         book_path.touch()
 
         path_str = str(book_path.absolute())
-        task = await wait_for_task(test_db_engine, "ADD", path_str, max_wait=5.0)
+        task = await wait_for_task(enqueued, "ADD", path_str, max_wait=10.0)
 
         assert task is not None
         assert task.payload["path"] == path_str
@@ -1,10 +1,26 @@
+import errno
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
 
-from kobold.models import Book
-from kobold.organizer import LibraryOrganizer
+from kobold.organizer import LibraryOrganizer, _generate_unique_path, _move_file
+
+BOOK_TEMPLATE = {
+    "id": "123",
+    "title": "Test Book",
+    "author": "Test Author",
+    "series": None,
+    "series_index": None,
+    "language": "en",
+    "genre": "Fiction",
+    "publication_date": None,
+    "file_path": "/books/incoming/test.epub",
+    "kepub_path": None,
+    "file_hash": "test_hash",
+    "file_size": 1024,
+}
 
 
 class TestLibraryOrganizer:
@@ -22,32 +38,20 @@ class TestLibraryOrganizer:
 
     @pytest.fixture
     def mock_book(self):
-        book = Mock(spec=Book)
-        book.id = "123"
-        book.title = "Test Book"
-        book.author = "Test Author"
-        book.series = None
-        book.series_index = None
-        book.language = "en"
-        book.genre = "Fiction"
-        book.publication_date = None
-        book.file_path = "/books/incoming/test.epub"
-        book.kepub_path = None
-        book.file_hash = "test_hash"
-        return book
+        # Tests mutate a field or two, so each gets a fresh namespace built
+        # from the shared template.
+        return SimpleNamespace(**BOOK_TEMPLATE)
 
     def test_organize_disabled(self, mock_book, mock_settings, organizer):
         mock_settings.ORGANIZE_LIBRARY = False
         assert organizer.organize_book(mock_book) is None
 
-    @patch("kobold.organizer.shutil.move")
+    @patch("kobold.organizer._move_file")
     @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists")
+    @patch("pathlib.Path.stat", side_effect=FileNotFoundError)
     def test_organize_moves_file(
-        self, mock_exists, mock_mkdir, mock_move, mock_book, organizer
+        self, mock_stat, mock_mkdir, mock_move, mock_book, organizer
     ):
-        mock_exists.return_value = False
-
         new_path = organizer.organize_book(mock_book)
 
         expected_path = "/books/Test Author/Test Book/test.epub"
@@ -55,39 +59,49 @@ class TestLibraryOrganizer:
         mock_mkdir.assert_called()
         mock_move.assert_called()
 
-    @patch("kobold.organizer.shutil.move")
+    @patch("kobold.organizer._move_file")
     @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists")
+    @patch("kobold.organizer.os.scandir")
+    @patch("pathlib.Path.stat")
     @patch("kobold.organizer.get_file_hash")
     def test_organize_handles_collision_with_rename(
-        self, mock_hash, mock_exists, mock_mkdir, mock_move, mock_book, organizer
+        self,
+        mock_hash,
+        mock_stat,
+        mock_scandir,
+        mock_mkdir,
+        mock_move,
+        mock_book,
+        organizer,
     ):
-        mock_exists.side_effect = [True, False]
+        # The target exists with the same size but different content, and
+        # nothing else is in its directory.
+        mock_stat.return_value = Mock(st_size=1024)
+        mock_scandir.return_value.__enter__.return_value = []
         mock_hash.return_value = "different_hash"
         mock_book.file_hash = "original_hash"
 
         new_path = organizer.organize_book(mock_book)
 
-        assert "_1" in new_path
-        assert new_path.endswith(".epub")
+        assert new_path == "/books/Test Author/Test Book/test_1.epub"
         mock_move.assert_called()
 
     @patch("pathlib.Path.unlink")
-    @patch("kobold.organizer.shutil.move")
+    @patch("kobold.organizer._move_file")
     @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists")
+    @patch("pathlib.Path.stat")
     @patch("kobold.organizer.get_file_hash")
     def test_organize_deduplicates_identical_file(
         self,
         mock_hash,
-        mock_exists,
+        mock_stat,
         mock_mkdir,
         mock_move,
         mock_unlink,
         mock_book,
         organizer,
     ):
-        mock_exists.return_value = True
+        mock_stat.return_value = Mock(st_size=1024)
         mock_hash.return_value = "same_hash"
         mock_book.file_hash = "same_hash"
 
@@ -98,65 +112,144 @@ class TestLibraryOrganizer:
         mock_unlink.assert_called()
         mock_move.assert_not_called()
 
-    @patch("kobold.organizer.shutil.move")
+    @patch("kobold.organizer._move_file")
     @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists")
+    @patch("kobold.organizer.os.scandir")
+    @patch("pathlib.Path.stat")
+    @patch("kobold.organizer.get_file_hash")
+    def test_organize_skips_hash_when_sizes_differ(
+        self,
+        mock_hash,
+        mock_stat,
+        mock_scandir,
+        mock_mkdir,
+        mock_move,
+        mock_book,
+        organizer,
+    ):
+        mock_stat.return_value = Mock(st_size=2048)
+        mock_scandir.return_value.__enter__.return_value = []
+
+        new_path = organizer.organize_book(mock_book)
+
+        assert new_path == "/books/Test Author/Test Book/test_1.epub"
+        mock_hash.assert_not_called()
+        mock_move.assert_called()
+
+    @patch("kobold.organizer._move_file")
+    @patch("pathlib.Path.stat")
     def test_organize_skips_if_already_in_place(
-        self, mock_exists, mock_mkdir, mock_move, mock_book, organizer
+        self, mock_stat, mock_move, mock_book, organizer
     ):
         mock_book.file_path = "/books/Test Author/Test Book/test.epub"
-        mock_exists.return_value = False
 
         new_path = organizer.organize_book(mock_book)
         assert new_path is None
+        mock_stat.assert_not_called()
         mock_move.assert_not_called()
 
     @patch("pathlib.Path.unlink")
-    @patch("kobold.organizer.shutil.move")
+    @patch("kobold.organizer._move_file")
     @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists")
+    @patch("kobold.organizer.os.scandir")
+    @patch("pathlib.Path.stat")
     @patch("kobold.organizer.get_file_hash")
     def test_deduplication_delete_fails_falls_back_to_rename(
         self,
         mock_hash,
-        mock_exists,
+        mock_stat,
+        mock_scandir,
         mock_mkdir,
         mock_move,
         mock_unlink,
         mock_book,
         organizer,
     ):
-        # First call: target exists, second call: unique path doesn't exist
-        mock_exists.side_effect = [True, False]
+        # The target holds identical content but the source can't be removed,
+        # so the organizer moves it next to the target under a new name.
+        mock_stat.return_value = Mock(st_size=1024)
+        mock_scandir.return_value.__enter__.return_value = []
         mock_hash.return_value = "same_hash"
         mock_book.file_hash = "same_hash"
         mock_unlink.side_effect = OSError("Permission denied")
 
         new_path = organizer.organize_book(mock_book)
 
-        assert "_1" in new_path
+        assert new_path == "/books/Test Author/Test Book/test_1.epub"
         mock_move.assert_called()
 
-    @patch("kobold.organizer.shutil.move")
+    @patch("kobold.organizer._move_file")
     @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists")
+    @patch("pathlib.Path.stat", side_effect=FileNotFoundError)
     def test_organize_mkdir_fails(
-        self, mock_exists, mock_mkdir, mock_move, mock_book, organizer
+        self, mock_stat, mock_mkdir, mock_move, mock_book, organizer
     ):
-        mock_exists.return_value = False
         mock_mkdir.side_effect = OSError("Cannot create directory")
 
         with pytest.raises(OSError, match="Cannot create directory"):
             organizer.organize_book(mock_book)
 
-    @patch("kobold.organizer.shutil.move")
+    @patch("kobold.organizer._move_file")
     @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists")
+    @patch("pathlib.Path.stat", side_effect=FileNotFoundError)
     def test_organize_move_fails(
-        self, mock_exists, mock_mkdir, mock_move, mock_book, organizer
+        self, mock_stat, mock_mkdir, mock_move, mock_book, organizer
     ):
-        mock_exists.return_value = False
         mock_move.side_effect = OSError("Cannot move file")
 
         with pytest.raises(OSError, match="Cannot move file"):
             organizer.organize_book(mock_book)
+
+
+class TestMoveFile:
+    def test_renames_within_filesystem(self, tmp_path):
+        source = tmp_path / "source.epub"
+        source.write_bytes(b"content")
+        target = tmp_path / "target.epub"
+
+        with patch("kobold.organizer.shutil.move") as mock_move:
+            _move_file(source, target)
+
+        assert not source.exists()
+        assert target.read_bytes() == b"content"
+        mock_move.assert_not_called()
+
+    @patch("kobold.organizer.shutil.move")
+    @patch("pathlib.Path.replace")
+    def test_falls_back_to_copy_across_devices(self, mock_replace, mock_move):
+        mock_replace.side_effect = OSError(errno.EXDEV, "Cross-device link")
+
+        _move_file(Path("/a/book.epub"), Path("/b/book.epub"))
+
+        mock_move.assert_called_once_with("/a/book.epub", "/b/book.epub")
+
+    @patch("kobold.organizer.shutil.move")
+    @patch("pathlib.Path.replace")
+    def test_other_errors_propagate(self, mock_replace, mock_move):
+        mock_replace.side_effect = OSError(errno.EACCES, "Permission denied")
+
+        with pytest.raises(OSError, match="Permission denied"):
+            _move_file(Path("/a/book.epub"), Path("/b/book.epub"))
+        mock_move.assert_not_called()
+
+
+class TestGenerateUniquePath:
+    def test_picks_first_free_counter(self, tmp_path):
+        for name in ("book.epub", "book_1.epub", "book_2.epub"):
+            (tmp_path / name).touch()
+
+        assert _generate_unique_path(tmp_path / "book.epub") == (
+            tmp_path / "book_3.epub"
+        )
+
+    def test_missing_parent_directory(self, tmp_path):
+        path = tmp_path / "missing" / "book.epub"
+
+        assert _generate_unique_path(path) == tmp_path / "missing" / "book_1.epub"
+
+    def test_raises_when_exhausted(self, tmp_path):
+        for counter in range(1, 1001):
+            (tmp_path / f"book_{counter}.epub").touch()
+
+        with pytest.raises(OSError, match="Could not generate unique path"):
+            _generate_unique_path(tmp_path / "book.epub")
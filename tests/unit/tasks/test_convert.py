@@ -13,6 +13,13 @@ def mock_session():
     return MagicMock(spec=Session)
 
 
+@pytest.fixture
+def mock_session_instance(mock_session):
+    instance = MagicMock(spec=Session)
+    mock_session.return_value.__enter__.return_value = instance
+    return instance
+
+
 @pytest.fixture
 def mock_engine():
     return Mock()
@@ -35,7 +42,7 @@ def conversion_service(mock_settings, mock_engine, mock_converter):
 
 @pytest.mark.asyncio
 async def test_process_converts_book(
-    conversion_service, mock_session, mock_converter, mock_engine
+    conversion_service, mock_session, mock_session_instance, mock_converter, mock_engine
 ):
     book_id = "123e4567-e89b-12d3-a456-426614174000"
 
@@ -45,8 +52,6 @@ async def test_process_converts_book(
     mock_book.is_converted = False
     mock_book.title = "Test"
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = mock_book
 
     with (
@@ -68,7 +73,7 @@ async def test_process_converts_book(
 
 @pytest.mark.asyncio
 async def test_process_deletes_original(
-    conversion_service, mock_session, mock_converter, mock_engine
+    conversion_service, mock_session, mock_session_instance, mock_converter, mock_engine
 ):
     book_id = "123e4567-e89b-12d3-a456-426614174000"
 
@@ -78,8 +83,6 @@ async def test_process_deletes_original(
     mock_book.file_path = "/books/test.epub"
     mock_book.is_converted = False
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = mock_book
 
     mock_path = MagicMock(spec=Path)
@@ -105,10 +108,10 @@ async def test_process_missing_book_id(conversion_service):
 
 
 @pytest.mark.asyncio
-async def test_process_nonexistent_book(conversion_service, mock_session, mock_engine):
+async def test_process_nonexistent_book(
+    conversion_service, mock_session, mock_session_instance, mock_engine
+):
     """When book doesn't exist in database, job returns early without error."""
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = None
 
     with patch("kobold.tasks.convert.Session", mock_session):
@@ -119,14 +122,12 @@ async def test_process_nonexistent_book(conversion_service, mock_session, mock_e
 
 @pytest.mark.asyncio
 async def test_process_already_converted(
-    conversion_service, mock_session, mock_converter, mock_engine
+    conversion_service, mock_session, mock_session_instance, mock_converter, mock_engine
 ):
     mock_book = Mock(spec=Book)
     mock_book.is_converted = True
     mock_book.title = "Test"
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = mock_book
 
     with patch("kobold.tasks.convert.Session", mock_session):
@@ -139,15 +140,13 @@ async def test_process_already_converted(
 
 @pytest.mark.asyncio
 async def test_process_source_file_not_found(
-    conversion_service, mock_session, mock_engine
+    conversion_service, mock_session, mock_session_instance, mock_engine
 ):
     mock_book = Mock(spec=Book)
     mock_book.file_path = "/books/missing.epub"
     mock_book.is_converted = False
     mock_book.title = "Test"
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = mock_book
 
     with (
@@ -162,15 +161,13 @@ async def test_process_source_file_not_found(
 
 @pytest.mark.asyncio
 async def test_process_conversion_fails(
-    conversion_service, mock_session, mock_converter, mock_engine
+    conversion_service, mock_session, mock_session_instance, mock_converter, mock_engine
 ):
     mock_book = Mock(spec=Book)
     mock_book.file_path = "/books/test.epub"
     mock_book.is_converted = False
     mock_book.title = "Test"
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = mock_book
 
     mock_converter.convert = AsyncMock(return_value=None)
@@ -187,7 +184,7 @@ async def test_process_conversion_fails(
 
 @pytest.mark.asyncio
 async def test_process_delete_fails_gracefully(
-    conversion_service, mock_session, mock_converter, mock_engine
+    conversion_service, mock_session, mock_session_instance, mock_converter, mock_engine
 ):
     book_id = "123e4567-e89b-12d3-a456-426614174000"
     conversion_service.settings.DELETE_ORIGINAL_AFTER_CONVERSION = True
@@ -197,8 +194,6 @@ async def test_process_delete_fails_gracefully(
     mock_book.is_converted = False
     mock_book.title = "Test"
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = mock_book
 
     mock_path = MagicMock(spec=Path)
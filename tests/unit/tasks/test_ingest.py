@@ -1,17 +1,30 @@
+from dataclasses import dataclass, field
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from typing import Any
+from unittest.mock import MagicMock, Mock
 
 import pytest
 from sqlmodel import Session
 
 from kobold.models import Book
+from kobold.tasks import ingest
 from kobold.tasks.ingest import IngestTask
+from kobold.tasks.metadata import MetadataTask
 from kobold.tasks.organize import OrganizeTask
 
 
+@pytest.fixture(autouse=True)
+def mock_session(monkeypatch):
+    session = MagicMock(spec=Session)
+    monkeypatch.setattr(ingest, "Session", session)
+    return session
+
+
 @pytest.fixture
-def mock_session():
-    return MagicMock(spec=Session)
+def mock_session_instance(mock_session):
+    instance = MagicMock(spec=Session)
+    mock_session.return_value.__enter__.return_value = instance
+    return instance
 
 
 @pytest.fixture
@@ -34,291 +47,237 @@ def ingest_service(mock_settings, mock_engine, mock_task_queue):
     return IngestTask(mock_settings, mock_engine, mock_task_queue)
 
 
-@pytest.mark.asyncio
-async def test_process_dispatch(ingest_service):
-    """Test that process dispatches to correct handler."""
-    with (
-        patch.object(ingest_service, "_handle_add", new_callable=AsyncMock) as mock_add,
-        patch.object(
-            ingest_service, "_handle_delete", new_callable=AsyncMock
-        ) as mock_del,
-    ):
-        # Test ADD
-        await ingest_service.process({"event": "ADD", "path": "/path/to/file.epub"})
-        mock_add.assert_called_once()
-        mock_del.assert_not_called()
-
-        mock_add.reset_mock()
-        mock_del.reset_mock()
-
-        await ingest_service.process({"event": "DELETE", "path": "/path/to/file.epub"})
-        mock_del.assert_called_once()
-        mock_add.assert_not_called()
+@pytest.fixture
+def handled(ingest_service, monkeypatch) -> list[tuple[str, Path]]:
+    """Replace the add/delete handlers with ones that record their calls."""
+    calls: list[tuple[str, Path]] = []
 
+    async def record_add(path: Path, log: Any) -> None:
+        calls.append(("add", path))
 
-@pytest.mark.asyncio
-async def test_handle_add_new_file(
-    ingest_service, mock_session, mock_task_queue, mock_engine
-):
-    path = Path("/books/new_book.epub")
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.exec.return_value.first.side_effect = [None, None]
-
-    with (
-        patch("kobold.tasks.ingest.Session", mock_session),
-        patch("pathlib.Path.exists", return_value=True),
-        patch("pathlib.Path.stat", return_value=Mock(st_size=1024)),
-        patch("kobold.tasks.ingest.get_file_hash", return_value="hash123"),
-    ):
-        await ingest_service._handle_add(path, Mock())
+    async def record_delete(path: Path, log: Any) -> None:
+        calls.append(("delete", path))
 
-        mock_session_instance.add.assert_called()
-        args = mock_session_instance.add.call_args[0]
-        assert isinstance(args[0], Book)
-        assert args[0].title == "new_book"
-        assert args[0].file_hash == "hash123"
+    monkeypatch.setattr(ingest_service, "_handle_add", record_add)
+    monkeypatch.setattr(ingest_service, "_handle_delete", record_delete)
+    return calls
 
-        assert mock_task_queue.add_task.call_count >= 1
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        pytest.param(
+            {"event": "ADD", "path": "/books/file.epub"},
+            [("add", Path("/books/file.epub"))],
+            id="add",
+        ),
+        pytest.param(
+            {"event": "MODIFIED", "path": "/books/file.epub"},
+            [("add", Path("/books/file.epub"))],
+            id="modified",
+        ),
+        pytest.param(
+            {"event": "DELETE", "path": "/books/file.epub"},
+            [("delete", Path("/books/file.epub"))],
+            id="delete",
+        ),
+        pytest.param(
+            {
+                "event": "RENAME",
+                "path": "/books/new.epub",
+                "old_path": "/books/old.epub",
+            },
+            [("add", Path("/books/new.epub")), ("delete", Path("/books/old.epub"))],
+            id="rename_adds_then_deletes",
+        ),
+        pytest.param(
+            {"event": "RENAME", "path": "/books/new.epub"},
+            [("add", Path("/books/new.epub"))],
+            id="rename_missing_old_path",
+        ),
+        pytest.param({"event": "ADD"}, [], id="missing_path"),
+        pytest.param(
+            {"event": "UNKNOWN", "path": "/books/file.epub"}, [], id="unknown_event"
+        ),
+    ],
+)
+async def test_process_dispatch(ingest_service, handled, payload, expected):
+    await ingest_service.process(payload)
+
+    assert handled == expected
 
 
 @pytest.mark.asyncio
-async def test_handle_delete(ingest_service, mock_session, mock_engine):
+async def test_handle_delete(ingest_service, mock_session_instance):
     path = Path("/books/deleted.epub")
 
     mock_book = Mock(spec=Book)
     mock_book.id = "123"
     mock_book.title = "Deleted Book"
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.exec.return_value.first.return_value = mock_book
 
-    with patch("kobold.tasks.ingest.Session", mock_session):
-        await ingest_service._handle_delete(path, Mock())
-
-        mock_book.mark_deleted.assert_called_once()
-        mock_session_instance.add.assert_called_with(mock_book)
-        mock_session_instance.commit.assert_called_once()
+    await ingest_service._handle_delete(path, Mock())
 
-
-@pytest.mark.asyncio
-async def test_handle_add_restores_soft_deleted_book(
-    ingest_service, mock_session, mock_task_queue, mock_engine
-):
-    path = Path("/books/restored_book.epub")
-
-    mock_deleted_book = Mock(spec=Book)
-    mock_deleted_book.id = "456"
-    mock_deleted_book.title = "Restored Book"
-    mock_deleted_book.is_deleted = True
-    mock_deleted_book.file_path = str(path)
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    # First query (by hash): no match
-    # Second query (by path): returns soft-deleted book
-    mock_session_instance.exec.return_value.first.side_effect = [
-        None,
-        mock_deleted_book,
-    ]
-
-    with (
-        patch("kobold.tasks.ingest.Session", mock_session),
-        patch("pathlib.Path.exists", return_value=True),
-        patch("pathlib.Path.stat", return_value=Mock(st_size=1024)),
-        patch("kobold.tasks.ingest.get_file_hash", return_value="hash456"),
-    ):
-        await ingest_service._handle_add(path, Mock())
-
-        assert mock_deleted_book.is_deleted is False
-        assert mock_deleted_book.deleted_at is None
-        mock_deleted_book.mark_updated.assert_called_once()
-        mock_session_instance.add.assert_called_with(mock_deleted_book)
-        mock_session_instance.commit.assert_called_once()
+    mock_book.mark_deleted.assert_called_once()
+    mock_session_instance.add.assert_called_with(mock_book)
+    mock_session_instance.commit.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_process_missing_path(ingest_service):
-    with (
-        patch.object(ingest_service, "_handle_add", new_callable=AsyncMock) as mock_add,
-        patch.object(
-            ingest_service, "_handle_delete", new_callable=AsyncMock
-        ) as mock_del,
-    ):
-        await ingest_service.process({"event": "ADD"})  # Missing path
+async def test_handle_add_non_existent_file(ingest_service, mock_session, tmp_path):
+    await ingest_service._handle_add(tmp_path / "missing.epub", Mock())
 
-        mock_add.assert_not_called()
-        mock_del.assert_not_called()
+    mock_session.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_process_unknown_event(ingest_service):
-    with (
-        patch.object(ingest_service, "_handle_add", new_callable=AsyncMock) as mock_add,
-        patch.object(
-            ingest_service, "_handle_delete", new_callable=AsyncMock
-        ) as mock_del,
-    ):
-        await ingest_service.process({"event": "UNKNOWN", "path": "/path/to/file.epub"})
+async def test_handle_add_unsupported_extension(ingest_service, mock_session, tmp_path):
+    path = tmp_path / "not_a_book.txt"
+    path.touch()
 
-        mock_add.assert_not_called()
-        mock_del.assert_not_called()
+    await ingest_service._handle_add(path, Mock())
 
-
-@pytest.mark.asyncio
-async def test_handle_add_non_existent_file(ingest_service):
-    """Test _handle_add with non-existent file."""
-    path = Path("/books/missing.epub")
-
-    with patch("pathlib.Path.exists", return_value=False):
-        await ingest_service._handle_add(path, Mock())
-
-        # Should return early without error
-        pass
+    mock_session.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_handle_add_unsupported_extension(ingest_service):
-    path = Path("/books/not_a_book.txt")
-
-    with (
-        patch("pathlib.Path.exists", return_value=True),
-        patch("kobold.tasks.ingest.SUPPORTED_EXTENSIONS", {".epub", ".kepub"}),
-    ):
+async def test_handle_add_hashing_failure(ingest_service, tmp_path, monkeypatch):
+    path = tmp_path / "error.epub"
+    path.touch()
+    monkeypatch.setattr(
+        ingest, "get_file_hash", Mock(side_effect=Exception("Disk error"))
+    )
+
+    with pytest.raises(Exception, match="Disk error"):
         await ingest_service._handle_add(path, Mock())
 
-        # Should return early without error and not call database
-        pass
 
-
-@pytest.mark.asyncio
-async def test_handle_add_hashing_failure(ingest_service):
-    path = Path("/books/error.epub")
-
-    with (
-        patch("pathlib.Path.exists", return_value=True),
-        patch("pathlib.Path.stat", return_value=Mock(st_size=1024)),
-        patch(
-            "kobold.tasks.ingest.get_file_hash",
-            side_effect=Exception("Disk error"),
+@dataclass
+class AddScenario:
+    path: str
+    by_hash: dict[str, Any] | None = None
+    by_path: dict[str, Any] | None = None
+    existing: set[str] = field(default_factory=set)
+    expect_commit: bool = False
+    expect_unlink: bool = False
+    expect_task: str | None = None
+
+
+ADD_SCENARIOS = [
+    pytest.param(
+        AddScenario(
+            path="new_book.epub",
+            existing={"new_book.epub"},
+            expect_commit=True,
+            expect_task=MetadataTask.TASK_TYPE,
         ),
-        pytest.raises(Exception, match="Disk error"),
-    ):
-        await ingest_service._handle_add(path, Mock())
-
-
-@pytest.mark.asyncio
-async def test_handle_add_idempotency(ingest_service, mock_session):
-    """Test _handle_add when book already exists with same path and hash."""
-    path = Path("/books/existing.epub")
-
-    mock_book = Mock(spec=Book)
-    mock_book.id = "123"
-    mock_book.file_path = str(path)
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    # existing_book found by hash and size
-    mock_session_instance.exec.return_value.first.return_value = mock_book
-
-    with (
-        patch("kobold.tasks.ingest.Session", mock_session),
-        patch("pathlib.Path.exists", return_value=True),
-        patch("pathlib.Path.stat", return_value=Mock(st_size=1024)),
-        patch("kobold.tasks.ingest.get_file_hash", return_value="hash123"),
-    ):
-        await ingest_service._handle_add(path, Mock())
-
-        mock_session_instance.commit.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_handle_add_duplicate_file_deleted(ingest_service, mock_session):
-    """Test Scenario A: Duplicate file deleted if original exists."""
-    new_path = Path("/books/duplicate.epub")
-    original_str = "/books/original.epub"
-
-    mock_book = Mock(spec=Book)
-    mock_book.id = "123"
-    mock_book.file_path = original_str
-    mock_book.title = "Original Book"
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.exec.return_value.first.return_value = mock_book
-
-    def exists_side_effect(self):
-        # Original file exists
-        if str(self) == original_str:
-            return True
-        # New file exists (initially)
-        return str(self) == str(new_path)
-
-    with (
-        patch("kobold.tasks.ingest.Session", mock_session),
-        patch(
-            "pathlib.Path.exists",
-            start_new_session=True,
-            autospec=True,
-            side_effect=exists_side_effect,
+        id="new_file",
+    ),
+    pytest.param(
+        AddScenario(
+            path="restored_book.epub",
+            by_path={
+                "id": "456",
+                "title": "Restored Book",
+                "is_deleted": True,
+                "file_path": "restored_book.epub",
+            },
+            existing={"restored_book.epub"},
+            expect_commit=True,
         ),
-        patch("pathlib.Path.stat", return_value=Mock(st_size=1024)),
-        patch("pathlib.Path.unlink") as mock_unlink,
-        patch("kobold.tasks.ingest.get_file_hash", return_value="hash123"),
-    ):
-        await ingest_service._handle_add(new_path, Mock())
-
-        mock_unlink.assert_called_once()
-        mock_session_instance.commit.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_handle_add_self_healing(ingest_service, mock_session, mock_task_queue):
-    """Test Scenario B: Self-healing if original file is missing."""
-    new_path = Path("/books/restored.epub")
-    original_str = "/books/missing_original.epub"
-
-    mock_book = Mock(spec=Book)
-    mock_book.id = "123"
-    mock_book.file_path = original_str
-    mock_book.title = "Broken Link Book"
-    mock_book.is_deleted = False
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.exec.return_value.first.return_value = mock_book
-
-    def exists_side_effect(self):
-        # Original file MISSING
-        if str(self) == original_str:
-            return False
-        # New file exists
-        # New file exists
-        return str(self) == str(new_path)
-
-    with (
-        patch("kobold.tasks.ingest.Session", mock_session),
-        patch(
-            "pathlib.Path.exists",
-            start_new_session=True,
-            autospec=True,
-            side_effect=exists_side_effect,
+        id="restores_soft_deleted_book",
+    ),
+    pytest.param(
+        AddScenario(
+            path="existing.epub",
+            by_hash={"id": "123", "file_path": "existing.epub"},
+            existing={"existing.epub"},
         ),
-        patch("pathlib.Path.stat", return_value=Mock(st_size=1024)),
-        patch("pathlib.Path.unlink") as mock_unlink,
-        patch("kobold.tasks.ingest.get_file_hash", return_value="hash123"),
-    ):
-        await ingest_service._handle_add(new_path, Mock())
-
-        mock_unlink.assert_not_called()
+        id="idempotency",
+    ),
+    pytest.param(
+        AddScenario(
+            path="duplicate.epub",
+            by_hash={
+                "id": "123",
+                "title": "Original Book",
+                "file_path": "original.epub",
+            },
+            existing={"original.epub", "duplicate.epub"},
+            expect_unlink=True,
+        ),
+        id="duplicate_file_deleted",
+    ),
+    pytest.param(
+        AddScenario(
+            path="restored.epub",
+            by_hash={
+                "id": "123",
+                "title": "Broken Link Book",
+                "is_deleted": False,
+                "file_path": "missing_original.epub",
+            },
+            existing={"restored.epub"},
+            expect_commit=True,
+            expect_task=OrganizeTask.TASK_TYPE,
+        ),
+        id="self_healing",
+    ),
+]
 
-        assert mock_book.file_path == str(new_path)
-        mock_session_instance.add.assert_called_with(mock_book)
-        mock_session_instance.commit.assert_called_once()
 
-        mock_task_queue.add_task.assert_called_with(
-            OrganizeTask.TASK_TYPE,
-            payload={"book_id": str(mock_book.id)},
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scenario", ADD_SCENARIOS)
+async def test_handle_add(
+    ingest_service,
+    mock_session_instance,
+    mock_task_queue,
+    tmp_path,
+    monkeypatch,
+    scenario: AddScenario,
+):
+    def book(attrs: dict[str, Any] | None) -> Mock | None:
+        if attrs is None:
+            return None
+        return Mock(
+            spec=Book, **{**attrs, "file_path": str(tmp_path / attrs["file_path"])}
         )
+
+    path = tmp_path / scenario.path
+    for name in scenario.existing:
+        (tmp_path / name).write_bytes(b"book")
+
+    by_hash = book(scenario.by_hash)
+    by_path = book(scenario.by_path)
+    matched = by_hash or by_path
+
+    mock_session_instance.exec.return_value.first.side_effect = [by_hash, by_path]
+
+    monkeypatch.setattr(ingest, "get_file_hash", Mock(return_value="hash123"))
+    await ingest_service._handle_add(path, Mock())
+
+    assert path.exists() is not scenario.expect_unlink
+    assert mock_session_instance.commit.called is scenario.expect_commit
+
+    if scenario.expect_commit:
+        added = mock_session_instance.add.call_args[0][0]
+        if matched is None:
+            assert isinstance(added, Book)
+            assert added.title == path.stem
+            assert added.file_hash == "hash123"
+        else:
+            assert added is matched
+            assert matched.file_path == str(path)
+            assert matched.is_deleted is False
+            assert matched.deleted_at is None
+            matched.mark_updated.assert_called_once()
+
+    if scenario.expect_task is None:
+        mock_task_queue.add_task.assert_not_called()
+    else:
+        task_type = mock_task_queue.add_task.call_args_list[0].args[0]
+        assert task_type == scenario.expect_task
+        payload = mock_task_queue.add_task.call_args_list[0].kwargs["payload"]
+        assert payload == {"book_id": str(added.id)}
@@ -1,3 +1,5 @@
+import asyncio
+import threading
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from uuid import uuid4
 
@@ -8,12 +10,31 @@ from kobold.models import Book
 from kobold.tasks.metadata import MetadataTask
 from kobold.tasks.organize import OrganizeTask
 
+# A real Book is far cheaper to build than Mock(spec=Book).
+BOOK_TEMPLATE = {
+    "title": "Current Title",
+    "author": "Current Author",
+    "file_path": "/path/book.epub",
+    "file_hash": "dummy_hash",
+}
+
+
+def make_book(**overrides) -> Book:
+    return Book(**{**BOOK_TEMPLATE, **overrides})
+
 
 @pytest.fixture
 def mock_session():
     return MagicMock(spec=Session)
 
 
+@pytest.fixture
+def mock_session_instance(mock_session):
+    instance = MagicMock(spec=Session)
+    mock_session.return_value.__enter__.return_value = instance
+    return instance
+
+
 @pytest.fixture
 def mock_engine():
     return MagicMock()
@@ -39,6 +60,16 @@ def mock_queue():
     return Mock()
 
 
+@pytest.fixture
+def mock_http_client():
+    client = AsyncMock()
+    with patch(
+        "kobold.tasks.metadata.HttpClientManager.get_client",
+        AsyncMock(return_value=client),
+    ):
+        yield client
+
+
 @pytest.fixture
 def service(mock_settings, mock_engine, mock_metadata_manager, mock_queue):
     return MetadataTask(mock_settings, mock_engine, mock_metadata_manager, mock_queue)
@@ -89,11 +120,10 @@ async def test_process_successful(
 
 
 @pytest.mark.asyncio
-async def test_process_ignores_non_existent_book(service, mock_session):
+async def test_process_ignores_non_existent_book(
+    service, mock_session, mock_session_instance
+):
     book_id = "123e4567-e89b-12d3-a456-426614174000"
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session.return_value.__enter__.return_value = mock_session_instance
     mock_session_instance.get.return_value = None
 
     with patch("kobold.tasks.metadata.Session", mock_session):
@@ -103,21 +133,27 @@ async def test_process_ignores_non_existent_book(service, mock_session):
 
 
 @pytest.mark.asyncio
-async def test_process_handles_no_metadata_found(
-    service, mock_session, mock_metadata_manager
+@pytest.mark.parametrize(
+    "metadata",
+    [
+        pytest.param(None, id="no_metadata_found"),
+        pytest.param(
+            {"title": "Current Title", "author": "Current Author"},
+            id="no_updated_fields",
+        ),
+        pytest.param({"unknown_field": "some value"}, id="unknown_fields"),
+    ],
+)
+async def test_process_skips_update(
+    service, mock_session, mock_session_instance, mock_metadata_manager, metadata
 ):
     book_id = "123e4567-e89b-12d3-a456-426614174000"
 
-    mock_book = Mock(spec=Book)
-    mock_book.id = book_id
-    mock_book.title = "Title"
-    mock_book.file_path = "/path/book.epub"
+    book = make_book()
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.get.return_value = mock_book
+    mock_session_instance.get.return_value = book
 
-    mock_metadata_manager.get_metadata.return_value = None
+    mock_metadata_manager.get_metadata.return_value = metadata
 
     with patch("kobold.tasks.metadata.Session", mock_session):
         await service.process({"book_id": book_id})
@@ -127,178 +163,116 @@ async def test_process_handles_no_metadata_found(
 
 
 @pytest.mark.asyncio
-async def test_process_handles_no_updated_fields(
-    service, mock_session, mock_metadata_manager
+async def test_process_skips_cover_download_when_nothing_changed(
+    service,
+    mock_session,
+    mock_session_instance,
+    mock_metadata_manager,
+    mock_http_client,
 ):
-    book_id = "123e4567-e89b-12d3-a456-426614174000"
-
-    mock_book = Mock(spec=Book)
-    mock_book.id = book_id
-    mock_book.title = "Current Title"
-    mock_book.author = "Current Author"
-    mock_book.file_path = "/path/book.epub"
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.get.return_value = mock_book
-
+    service.settings.EMBED_METADATA = True
+    mock_session_instance.get.return_value = make_book(
+        cover_path="http://example.com/cover.jpg"
+    )
     mock_metadata_manager.get_metadata.return_value = {
         "title": "Current Title",
         "author": "Current Author",
+        "cover_path": "http://example.com/cover.jpg",
     }
 
     with patch("kobold.tasks.metadata.Session", mock_session):
-        await service.process({"book_id": book_id})
-
-    mock_session_instance.add.assert_not_called()
-    mock_session_instance.commit.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_process_ignores_unknown_fields(
-    service, mock_session, mock_metadata_manager
-):
-    book_id = "123e4567-e89b-12d3-a456-426614174000"
-
-    mock_book = Mock(spec=Book)
-    mock_book.id = book_id
-    mock_book.file_path = "/path/book.epub"
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.get.return_value = mock_book
-
-    mock_metadata_manager.get_metadata = AsyncMock(
-        return_value={"unknown_field": "some value"}
-    )
-
-    with patch("kobold.tasks.metadata.Session", mock_session):
-        await service.process({"book_id": book_id})
+        await service.process({"book_id": str(uuid4())})
 
-    mock_session_instance.add.assert_not_called()
+    mock_http_client.get.assert_not_awaited()
     mock_session_instance.commit.assert_not_called()
+    mock_metadata_manager.embed_metadata.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_process_handles_cover_download_failure(
-    service, mock_session, mock_metadata_manager, mock_engine
-):
-    book_id = "123e4567-e89b-12d3-a456-426614174000"
-
-    service.settings.EMBED_METADATA = True
-
-    mock_book = Mock(spec=Book)
-    mock_book.file_path = "/path/book.epub"
-    mock_book.isbn = None
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.get.return_value = mock_book
-
-    mock_metadata_manager.get_metadata = AsyncMock(
-        return_value={"title": "Title", "cover_path": "http://example.com/cover.jpg"}
-    )
-
-    mock_client = AsyncMock()
-    mock_client.get.return_value.status_code = 404
-
-    with (
-        patch("kobold.tasks.metadata.Session", mock_session),
-        patch(
-            "kobold.tasks.metadata.HttpClientManager.get_client",
-            AsyncMock(return_value=mock_client),
+@pytest.mark.parametrize(
+    ("get_response", "expected_cover"),
+    [
+        pytest.param(Mock(status_code=404), None, id="download_failure"),
+        pytest.param(Exception("Network error"), None, id="download_exception"),
+        pytest.param(
+            Mock(status_code=200, content=b"cover_data"), b"cover_data", id="embeds"
         ),
-    ):
-        await service.process({"book_id": book_id})
-
-        expected_metadata = {
-            "title": "Title",
-            "cover_path": "http://example.com/cover.jpg",
-        }
-        mock_metadata_manager.embed_metadata.assert_called_once_with(
-            "/path/book.epub", expected_metadata
-        )
-
-
-@pytest.mark.asyncio
-async def test_process_handles_cover_download_exception(
-    service, mock_session, mock_metadata_manager, mock_engine
+    ],
+)
+async def test_process_embeds_metadata(
+    service,
+    mock_session,
+    mock_session_instance,
+    mock_metadata_manager,
+    mock_http_client,
+    get_response,
+    expected_cover,
 ):
     book_id = "123e4567-e89b-12d3-a456-426614174000"
 
     service.settings.EMBED_METADATA = True
 
-    mock_book = Mock(spec=Book)
-    mock_book.file_path = "/path/book.epub"
-    mock_book.isbn = None
+    book = make_book()
 
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.get.return_value = mock_book
+    mock_session_instance.get.return_value = book
 
     mock_metadata_manager.get_metadata = AsyncMock(
         return_value={"title": "Title", "cover_path": "http://example.com/cover.jpg"}
     )
 
-    mock_client = AsyncMock()
-    mock_client.get.side_effect = Exception("Network error")
+    if isinstance(get_response, Exception):
+        mock_http_client.get.side_effect = get_response
+    else:
+        mock_http_client.get.return_value = get_response
 
-    with (
-        patch("kobold.tasks.metadata.Session", mock_session),
-        patch(
-            "kobold.tasks.metadata.HttpClientManager.get_client",
-            AsyncMock(return_value=mock_client),
-        ),
-    ):
+    with patch("kobold.tasks.metadata.Session", mock_session):
         await service.process({"book_id": book_id})
 
-        expected_metadata = {
-            "title": "Title",
-            "cover_path": "http://example.com/cover.jpg",
-        }
-        mock_metadata_manager.embed_metadata.assert_called_once_with(
-            "/path/book.epub", expected_metadata
-        )
+    expected_metadata = {
+        "title": "Title",
+        "cover_path": "http://example.com/cover.jpg",
+    }
+    if expected_cover is not None:
+        expected_metadata["cover_data"] = expected_cover
+    mock_metadata_manager.embed_metadata.assert_called_once_with(
+        "/path/book.epub", expected_metadata
+    )
 
 
 @pytest.mark.asyncio
-async def test_process_embeds_metadata(
-    service, mock_session, mock_metadata_manager, mock_engine
+async def test_process_downloads_cover_alongside_db_update(
+    service,
+    mock_session,
+    mock_session_instance,
+    mock_metadata_manager,
+    mock_http_client,
 ):
-    book_id = "123e4567-e89b-12d3-a456-426614174000"
-
     service.settings.EMBED_METADATA = True
+    loop = asyncio.get_running_loop()
+    committing = asyncio.Event()
+    downloaded = threading.Event()
+
+    async def fake_get(url):
+        # Only finishes once the commit is under way
+        await committing.wait()
+        downloaded.set()
+        return Mock(status_code=200, content=b"cover_data")
+
+    def fake_commit():
+        loop.call_soon_threadsafe(committing.set)
+        # Times out if the commit blocks the event loop
+        assert downloaded.wait(timeout=1.0)
+
+    mock_http_client.get.side_effect = fake_get
+    mock_session_instance.get.return_value = make_book()
+    mock_session_instance.commit.side_effect = fake_commit
+    mock_metadata_manager.get_metadata.return_value = {
+        "title": "Title",
+        "cover_path": "http://example.com/cover.jpg",
+    }
 
-    mock_book = Mock(spec=Book)
-    mock_book.file_path = "/path/book.epub"
-    mock_book.isbn = None
-
-    mock_session_instance = MagicMock(spec=Session)
-    mock_session.return_value.__enter__.return_value = mock_session_instance
-    mock_session_instance.get.return_value = mock_book
-
-    mock_metadata_manager.get_metadata = AsyncMock(
-        return_value={"title": "Title", "cover_path": "http://example.com/cover.jpg"}
-    )
-
-    mock_client = AsyncMock()
-    mock_client.get.return_value.status_code = 200
-    mock_client.get.return_value.content = b"cover_data"
-
-    with (
-        patch("kobold.tasks.metadata.Session", mock_session),
-        patch(
-            "kobold.tasks.metadata.HttpClientManager.get_client",
-            AsyncMock(return_value=mock_client),
-        ),
-    ):
-        await service.process({"book_id": book_id})
+    with patch("kobold.tasks.metadata.Session", mock_session):
+        await service.process({"book_id": str(uuid4())})
 
-        expected_metadata = {
-            "title": "Title",
-            "cover_path": "http://example.com/cover.jpg",
-            "cover_data": b"cover_data",
-        }
-        mock_metadata_manager.embed_metadata.assert_called_once_with(
-            "/path/book.epub", expected_metadata
-        )
+    embedded = mock_metadata_manager.embed_metadata.call_args.args[1]
+    assert embedded["cover_data"] == b"cover_data"
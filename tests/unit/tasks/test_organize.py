@@ -7,6 +7,7 @@ from sqlmodel import Session
 
 from kobold.models import Book
 from kobold.organizer import LibraryOrganizer
+from kobold.tasks import organize
 from kobold.tasks.organize import OrganizeTask
 
 
@@ -24,6 +25,15 @@ def mock_engine():
     return MagicMock()
 
 
+@pytest.fixture(autouse=True)
+def mock_session(monkeypatch):
+    session = Mock(spec=Session)
+    session.__enter__ = Mock(return_value=session)
+    session.__exit__ = Mock(return_value=None)
+    monkeypatch.setattr(organize, "Session", Mock(return_value=session))
+    return session
+
+
 @pytest.fixture
 def mock_organizer():
     return Mock(spec=LibraryOrganizer)
@@ -34,168 +44,91 @@ def service(mock_settings, mock_engine, mock_organizer):
     return OrganizeTask(mock_settings, mock_engine, mock_organizer)
 
 
-@pytest.mark.asyncio
-async def test_process_organizes_book(service, mock_engine):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
-
-    real_book = Book(
-        id=book_id,
+@pytest.fixture
+def book(mock_session):
+    book = Book(
+        id=uuid4(),
         title="My Title",
         author="My Author",
         file_path="/books/incoming/my_book.epub",
+        file_hash="dummy_hash",
     )
+    mock_session.get.return_value = book
+    return book
 
-    mock_session = Mock(spec=Session)
-    mock_session.get.return_value = real_book
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
 
-    mock_current_path = MagicMock()
-    mock_current_path.__str__.return_value = "/books/incoming/my_book.epub"
-    mock_current_path.exists.return_value = True
+def stage_paths(
+    service, tmp_path: Path, *, current_exists: bool, expected_exists: bool = False
+) -> tuple[Path, Path]:
+    """Have the organizer report real current/expected paths under tmp_path."""
+    current = tmp_path / "incoming" / "my_book.epub"
+    expected = tmp_path / "organized" / "my_book.epub"
+    for path, exists in ((current, current_exists), (expected, expected_exists)):
+        if exists:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
 
-    mock_expected_path = MagicMock()
-    mock_expected_path.__str__.return_value = "/books/organized/new_path.epub"
-
-    mock_organizer = service.organizer
-    mock_organizer.get_organize_path.return_value = (
-        mock_current_path,
-        mock_expected_path,
-    )
-    mock_organizer.organize_book.return_value = str(mock_expected_path)
-
-    with patch("kobold.tasks.organize.Session", return_value=mock_session):
-        await service.process(payload)
-
-    mock_organizer.organize_book.assert_called_once()
-    assert real_book.file_path == str(mock_expected_path)
-    mock_session.add.assert_called_with(real_book)
-    mock_session.commit.assert_called()
+    service.organizer.get_organize_path.return_value = (current, expected)
+    return current, expected
 
 
 @pytest.mark.asyncio
-async def test_process_recovers_from_zombie_state(service, mock_engine):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
+async def test_process_organizes_book(service, mock_session, book, tmp_path):
+    _, expected = stage_paths(service, tmp_path, current_exists=True)
+    service.organizer.organize_book.return_value = str(expected)
 
-    real_book = Book(
-        id=book_id,
-        title="My Title",
-        author="My Author",
-        file_path="/books/incoming/my_book.epub",
-        file_hash="dummy_hash",
-    )
-
-    mock_session = Mock(spec=Session)
-    mock_session.get.return_value = real_book
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
+    await service.process({"book_id": str(book.id)})
 
-    mock_current_path = MagicMock()
-    mock_current_path.__str__.return_value = "/books/incoming/my_book.epub"
-    mock_current_path.exists.return_value = False
+    service.organizer.organize_book.assert_called_once()
+    assert book.file_path == str(expected)
+    mock_session.add.assert_called_with(book)
+    mock_session.commit.assert_called()
 
-    mock_expected_path = MagicMock()
-    mock_expected_path.__str__.return_value = "/books/organized/new_path.epub"
-    mock_expected_path.exists.return_value = True
 
-    service.organizer.get_organize_path.return_value = (
-        mock_current_path,
-        mock_expected_path,
+@pytest.mark.asyncio
+async def test_process_recovers_from_zombie_state(
+    service, mock_session, book, tmp_path
+):
+    _, expected = stage_paths(
+        service, tmp_path, current_exists=False, expected_exists=True
     )
 
-    with (
-        patch("kobold.tasks.organize.Session", return_value=mock_session),
-        patch(
-            "kobold.tasks.organize.get_file_hash",
-            return_value="dummy_hash",
-        ) as mock_hash,
-    ):
-        await service.process(payload)
+    with patch(
+        "kobold.tasks.organize.get_file_hash", return_value="dummy_hash"
+    ) as mock_hash:
+        await service.process({"book_id": str(book.id)})
 
-    mock_hash.assert_called_once_with(mock_expected_path)
+    mock_hash.assert_called_once_with(expected)
     service.organizer.organize_book.assert_not_called()
-    assert real_book.file_path == str(mock_expected_path)
+    assert book.file_path == str(expected)
     mock_session.commit.assert_called()
 
 
 @pytest.mark.asyncio
-async def test_process_fails_recovery_on_hash_mismatch(service, mock_engine):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
-
-    real_book = Book(
-        id=book_id,
-        title="My Title",
-        author="My Author",
-        file_path="/books/incoming/my_book.epub",
-        file_hash="correct_hash",
-    )
-
-    mock_session = Mock(spec=Session)
-    mock_session.get.return_value = real_book
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
-
-    mock_current_path = MagicMock()
-    mock_current_path.exists.return_value = False
-
-    mock_expected_path = MagicMock()
-    mock_expected_path.exists.return_value = True
-
-    service.organizer.get_organize_path.return_value = (
-        mock_current_path,
-        mock_expected_path,
-    )
-
-    with (
-        patch("kobold.tasks.organize.Session", return_value=mock_session),
-        patch(
-            "kobold.tasks.organize.get_file_hash",
-            return_value="wrong_hash",
+@pytest.mark.parametrize(
+    ("expected_exists", "hash_result"),
+    [
+        pytest.param(True, {"return_value": "wrong_hash"}, id="hash_mismatch"),
+        pytest.param(
+            True, {"side_effect": Exception("I/O error")}, id="hash_verification_error"
         ),
-        pytest.raises(FileNotFoundError, match=r"Source file .* not found"),
-    ):
-        await service.process(payload)
-
-    mock_session.commit.assert_not_called()
-
-
-@pytest.mark.asyncio
-async def test_process_fails_if_source_and_target_missing(service, mock_engine):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
-
-    real_book = Book(
-        id=book_id,
-        title="My Title",
-        author="My Author",
-        file_path="/books/incoming/my_book.epub",
-    )
-
-    mock_session = Mock(spec=Session)
-    mock_session.get.return_value = real_book
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
-
-    mock_current_path = MagicMock()
-    mock_current_path.exists.return_value = False
-
-    mock_expected_path = MagicMock()
-    mock_expected_path.exists.return_value = False
-
-    service.organizer.get_organize_path.return_value = (
-        mock_current_path,
-        mock_expected_path,
+        pytest.param(False, {}, id="source_and_target_missing"),
+    ],
+)
+async def test_process_fails_recovery(
+    service, mock_session, book, tmp_path, expected_exists, hash_result
+):
+    stage_paths(
+        service, tmp_path, current_exists=False, expected_exists=expected_exists
     )
 
     with (
-        patch("kobold.tasks.organize.Session", return_value=mock_session),
+        patch("kobold.tasks.organize.get_file_hash", **hash_result) as mock_hash,
         pytest.raises(FileNotFoundError, match=r"Source file .* not found"),
     ):
-        await service.process(payload)
+        await service.process({"book_id": str(book.id)})
 
+    assert mock_hash.called is expected_exists
     service.organizer.organize_book.assert_not_called()
     mock_session.commit.assert_not_called()
 
@@ -221,126 +154,29 @@ async def test_process_missing_book_id(service):
 
 
 @pytest.mark.asyncio
-async def test_process_nonexistent_book(service):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
-
-    mock_session = Mock(spec=Session)
+async def test_process_nonexistent_book(service, mock_session):
     mock_session.get.return_value = None
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
 
-    with patch("kobold.tasks.organize.Session", return_value=mock_session):
-        await service.process(payload)
+    await service.process({"book_id": str(uuid4())})
 
     service.organizer.organize_book.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_process_hash_verification_error(service):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
-
-    real_book = Book(
-        id=book_id,
-        title="My Title",
-        author="My Author",
-        file_path="/books/incoming/my_book.epub",
-        file_hash="dummy_hash",
-    )
-
-    mock_session = Mock(spec=Session)
-    mock_session.get.return_value = real_book
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
-
-    mock_current_path = MagicMock()
-    mock_current_path.exists.return_value = False
-
-    mock_expected_path = MagicMock()
-    mock_expected_path.exists.return_value = True
-
-    service.organizer.get_organize_path.return_value = (
-        mock_current_path,
-        mock_expected_path,
-    )
-
-    with (
-        patch("kobold.tasks.organize.Session", return_value=mock_session),
-        patch(
-            "kobold.tasks.organize.get_file_hash",
-            side_effect=Exception("I/O error"),
-        ),
-        pytest.raises(FileNotFoundError),
-    ):
-        await service.process(payload)
-
-
-@pytest.mark.asyncio
-async def test_process_already_organized(service):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
-
-    real_book = Book(
-        id=book_id,
-        title="My Title",
-        author="My Author",
-        file_path="/books/organized/my_book.epub",
-    )
-
-    mock_session = Mock(spec=Session)
-    mock_session.get.return_value = real_book
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
-
-    mock_current_path = MagicMock()
-    mock_current_path.exists.return_value = True
-
-    mock_expected_path = MagicMock()
-
-    service.organizer.get_organize_path.return_value = (
-        mock_current_path,
-        mock_expected_path,
-    )
+async def test_process_already_organized(service, mock_session, book, tmp_path):
+    stage_paths(service, tmp_path, current_exists=True)
     service.organizer.organize_book.return_value = None
 
-    with patch("kobold.tasks.organize.Session", return_value=mock_session):
-        await service.process(payload)
+    await service.process({"book_id": str(book.id)})
 
     service.organizer.organize_book.assert_called_once()
     mock_session.commit.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_process_generic_exception(service):
-    book_id = uuid4()
-    payload = {"book_id": str(book_id)}
-
-    real_book = Book(
-        id=book_id,
-        title="My Title",
-        author="My Author",
-        file_path="/books/incoming/my_book.epub",
-    )
-
-    mock_session = Mock(spec=Session)
-    mock_session.get.return_value = real_book
-    mock_session.__enter__ = Mock(return_value=mock_session)
-    mock_session.__exit__ = Mock(return_value=None)
-
-    mock_current_path = MagicMock()
-    mock_current_path.exists.return_value = True
-
-    mock_expected_path = MagicMock()
-
-    service.organizer.get_organize_path.return_value = (
-        mock_current_path,
-        mock_expected_path,
-    )
+async def test_process_generic_exception(service, mock_session, book, tmp_path):
+    stage_paths(service, tmp_path, current_exists=True)
     service.organizer.organize_book.side_effect = RuntimeError("Unexpected error")
 
-    with (
-        patch("kobold.tasks.organize.Session", return_value=mock_session),
-        pytest.raises(RuntimeError, match="Unexpected error"),
-    ):
-        await service.process(payload)
+    with pytest.raises(RuntimeError, match="Unexpected error"):
+        await service.process({"book_id": str(book.id)})
@@ -22,3 +22,46 @@ def test_get_session_rollbacks_on_exception():
         mock_session.commit.assert_not_called()
         mock_session.rollback.assert_called_once()
         mock_session.close.assert_called_once()
+
+
+def test_create_db_and_tables_adds_missing_indexes(tmp_path):
+    from sqlalchemy import inspect, text
+    from sqlmodel import create_engine
+
+    from kobold.database import create_db_and_tables
+
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with patch("kobold.database.engine", test_engine):
+        create_db_and_tables()
+        with test_engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_task_claim"))
+
+        create_db_and_tables()
+
+    index_names = {ix["name"] for ix in inspect(test_engine).get_indexes("task")}
+    assert "ix_task_claim" in index_names
+
+
+def test_create_db_and_tables_matches_fresh_schema(tmp_path):
+    from sqlalchemy import inspect, text
+    from sqlmodel import create_engine
+
+    from kobold.database import create_db_and_tables
+
+    def index_names(engine):
+        return {ix["name"] for ix in inspect(engine).get_indexes("task")}
+
+    fresh_engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    with patch("kobold.database.engine", fresh_engine):
+        create_db_and_tables()
+
+    existing_engine = create_engine(f"sqlite:///{tmp_path / 'existing.db'}")
+    with patch("kobold.database.engine", existing_engine):
+        create_db_and_tables()
+        with existing_engine.begin() as conn:
+            conn.execute(text("CREATE INDEX ix_task_status ON task (status)"))
+
+        create_db_and_tables()
+
+    assert "ix_task_status" not in index_names(fresh_engine)
+    assert index_names(existing_engine) == index_names(fresh_engine)
@@ -1,9 +1,9 @@
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from kobold.kepubify import KepubifyBinary
+from kobold.kepubify import KepubifyBinary, _platform_binary_name
 
 
 class TestKepubifyBinaryUnit:
@@ -24,8 +24,8 @@ class TestKepubifyBinaryUnit:
     async def test_ensure_raises_on_download_failure(
         self, kepubify_binary: KepubifyBinary
     ) -> None:
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(side_effect=Exception("Network error"))
+        mock_client = MagicMock()
+        mock_client.stream.side_effect = Exception("Network error")
 
         with (
             patch("shutil.which", return_value=None),
@@ -52,3 +52,19 @@ class TestKepubifyBinaryUnit:
             second_result = await kepubify_binary.ensure()
 
         assert first_result == second_result
+
+    @patch("platform.machine", return_value="x86_64")
+    @patch("platform.system", return_value="Linux")
+    def test_platform_binary_name_is_resolved_once(
+        self, mock_system, mock_machine
+    ) -> None:
+        _platform_binary_name.cache_clear()
+        try:
+            first = KepubifyBinary(bin_dir=Path("/a"))._get_platform_binary_name()
+            second = KepubifyBinary(bin_dir=Path("/b"))._get_platform_binary_name()
+        finally:
+            _platform_binary_name.cache_clear()
+
+        assert first == second == "kepubify-linux-64bit"
+        mock_system.assert_called_once()
+        mock_machine.assert_called_once()
@@ -0,0 +1,45 @@
+import pytest
+
+from kobold.watcher import _coalesce_rename
+
+
+def test_coalesce_rename_merges_delete_and_add() -> None:
+    payloads = [
+        {"event": "DELETE", "path": "/books/old.epub"},
+        {"event": "ADD", "path": "/books/new.epub"},
+    ]
+
+    assert _coalesce_rename(payloads) == [
+        {"event": "RENAME", "path": "/books/new.epub", "old_path": "/books/old.epub"}
+    ]
+
+
+@pytest.mark.parametrize(
+    "payloads",
+    [
+        pytest.param(
+            [
+                {"event": "DELETE", "path": "/books/old.epub"},
+                {"event": "ADD", "path": "/books/new.pdf"},
+            ],
+            id="different_format",
+        ),
+        pytest.param(
+            [
+                {"event": "DELETE", "path": "/books/a.epub"},
+                {"event": "DELETE", "path": "/books/b.epub"},
+                {"event": "ADD", "path": "/books/c.epub"},
+            ],
+            id="ambiguous",
+        ),
+        pytest.param(
+            [
+                {"event": "MODIFIED", "path": "/books/a.epub"},
+                {"event": "ADD", "path": "/books/b.epub"},
+            ],
+            id="no_delete",
+        ),
+    ],
+)
+def test_coalesce_rename_leaves_other_batches(payloads) -> None:
+    assert _coalesce_rename(payloads) == payloads
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from kobold import worker as worker_module
 from kobold.models import Task as TaskModel
 from kobold.models import TaskStatus
 from kobold.task_queue import TaskQueue
@@ -40,20 +41,26 @@ async def run_worker_with_jobs(
     jobs: list[TaskModel],
     poll_interval: float = 0.01,
 ) -> None:
-    """Run the worker with jobs, then cancel it cleanly."""
+    """Run the worker until it has taken every job, then cancel it cleanly.
+
+    Each fetch hands the worker one job, so by the time it finds the queue
+    empty every earlier job has been completed, retried or failed.
+    """
     job_iter = iter(jobs)
+    drained = asyncio.Event()
 
-    def fetch_next():
-        try:
-            return next(job_iter)
-        except StopIteration:
-            return None
+    def fetch_tasks(limit):
+        job = next(job_iter, None)
+        if job is None:
+            drained.set()
+            return []
+        return [job]
 
-    mock_queue.fetch_next_task.side_effect = fetch_next
+    mock_queue.fetch_tasks.side_effect = fetch_tasks
 
     worker_task = asyncio.create_task(worker(mock_queue, mock_tasks, poll_interval))
 
-    await asyncio.sleep(0.05)
+    await asyncio.wait_for(drained.wait(), timeout=1.0)
     worker_task.cancel()
 
     with contextlib.suppress(asyncio.CancelledError):
@@ -141,28 +148,31 @@ async def test_worker_moves_to_dead_letter_after_max_retries(mock_tasks, mock_qu
 
 
 @pytest.mark.asyncio
-async def test_worker_handles_critical_loop_error(mock_tasks, mock_queue):
-    """Test that worker backs off after a critical error."""
+async def test_worker_handles_critical_loop_error(mock_tasks, mock_queue, monkeypatch):
+    """Test that worker backs off and keeps polling after a critical error."""
+    monkeypatch.setattr(worker_module, "WORKER_ERROR_BACKOFF", 0)
     call_count = 0
+    recovered = asyncio.Event()
 
-    def fetch_with_error():
+    def fetch_with_error(limit):
         nonlocal call_count
         call_count += 1
         if call_count == 1:
             raise Exception("Database is gone")
-        return None
+        recovered.set()
+        return []
 
-    mock_queue.fetch_next_task.side_effect = fetch_with_error
+    mock_queue.fetch_tasks.side_effect = fetch_with_error
 
-    worker_task = asyncio.create_task(worker(mock_queue, mock_tasks, 0.01))
+    worker_task = asyncio.create_task(worker(mock_queue, mock_tasks, 300.0))
 
-    await asyncio.sleep(0.1)
+    await asyncio.wait_for(recovered.wait(), timeout=1.0)
     worker_task.cancel()
 
     with contextlib.suppress(asyncio.CancelledError):
         await worker_task
 
-    assert call_count >= 1
+    assert call_count == 2
 
 
 @pytest.mark.asyncio
@@ -178,3 +188,101 @@ async def test_worker_processes_convert_job(mock_tasks, mock_queue):
 
     mock_tasks[ConvertTask.TASK_TYPE].process.assert_awaited_once_with(job.payload)
     mock_queue.complete_task.assert_called_with(2)
+
+
+@pytest.mark.asyncio
+async def test_worker_ignores_stale_task_signal(mock_tasks, mock_queue):
+    """A signal raised before the queue check does not cause a second fetch."""
+    mock_queue.task_event.set()
+    mock_queue.fetch_tasks.return_value = []
+
+    worker_task = asyncio.create_task(worker(mock_queue, mock_tasks, 10.0))
+
+    await asyncio.sleep(0.05)
+    worker_task.cancel()
+
+    with contextlib.suppress(asyncio.CancelledError):
+        await worker_task
+
+    mock_queue.fetch_tasks.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_worker_wakes_on_task_signal(mock_tasks, mock_queue):
+    """A signalled task is picked up without waiting for the poll interval."""
+    job = TaskModel(
+        id=3,
+        type=IngestTask.TASK_TYPE,
+        payload={"filepath": "/test/book.epub"},
+        status=TaskStatus.PENDING,
+    )
+    idle = asyncio.Event()
+    drained = asyncio.Event()
+    # Empty queue, then the signalled job, then empty again once it is done
+    results = iter([([], idle), ([job], None), ([], drained)])
+
+    def fetch_tasks(limit):
+        result, reached = next(results)
+        if reached is not None:
+            reached.set()
+        return result
+
+    mock_queue.fetch_tasks.side_effect = fetch_tasks
+
+    worker_task = asyncio.create_task(worker(mock_queue, mock_tasks, 300.0))
+    await asyncio.wait_for(idle.wait(), timeout=1.0)
+
+    mock_queue.task_event.set()
+    await asyncio.wait_for(drained.wait(), timeout=1.0)
+
+    worker_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await worker_task
+
+    mock_tasks[IngestTask.TASK_TYPE].process.assert_awaited_once_with(job.payload)
+
+
+@pytest.mark.asyncio
+async def test_worker_sets_ready_event_after_recovery(mock_tasks, mock_queue):
+    mock_queue.fetch_tasks.return_value = []
+    ready = asyncio.Event()
+
+    worker_task = asyncio.create_task(
+        worker(mock_queue, mock_tasks, 300.0, ready=ready)
+    )
+    await asyncio.wait_for(ready.wait(), timeout=1.0)
+
+    mock_queue.recover_stale_tasks.assert_called_once()
+
+    worker_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await worker_task
+
+
+@pytest.mark.asyncio
+async def test_worker_releases_unstarted_batch_on_cancel(mock_tasks, mock_queue):
+    """Cancelling mid-batch hands the tasks not yet started back to the queue."""
+    jobs = [
+        TaskModel(
+            id=i, type=IngestTask.TASK_TYPE, payload={}, status=TaskStatus.PENDING
+        )
+        for i in range(3)
+    ]
+    started = asyncio.Event()
+
+    async def block(payload):
+        started.set()
+        await asyncio.Event().wait()
+
+    mock_tasks[IngestTask.TASK_TYPE].process.side_effect = block
+    mock_queue.fetch_tasks.return_value = jobs
+
+    worker_task = asyncio.create_task(worker(mock_queue, mock_tasks, 300.0))
+    await asyncio.wait_for(started.wait(), timeout=1.0)
+
+    worker_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await worker_task
+
+    mock_queue.start_task.assert_called_once_with(jobs[0])
+    mock_queue.release_tasks.assert_called_once_with([0, 1, 2])
@@ -41,3 +41,28 @@ class TestPathTemplate:
         template = PathTemplate("{author}/{title}")
         metadata = {"author": " Author ", "title": " Title. "}
         assert str(template.render(metadata)) == "Author/Title"
+
+    def test_literal_text_between_variables(self):
+        template = PathTemplate("{author}/{series} - {series_index}/{title}")
+        metadata = {
+            "author": "Author",
+            "series": "Saga",
+            "series_index": "02",
+            "title": "Title",
+        }
+        assert str(template.render(metadata)) == "Author/Saga - 02/Title"
+
+    def test_value_resembling_variable_is_not_substituted(self):
+        template = PathTemplate("{author}/{title}")
+        metadata = {"author": "{title}", "title": "Title"}
+        assert str(template.render(metadata)) == "{title}/Title"
+
+    def test_literal_braces_are_preserved(self):
+        template = PathTemplate("{author}/{not a var}/{title}")
+        metadata = {"author": "Author", "title": "Title"}
+        assert str(template.render(metadata)) == "Author/{not a var}/Title"
+
+    def test_repeated_variable(self):
+        template = PathTemplate("{author}/{author} - {title}")
+        metadata = {"author": "Author", "title": "Title"}
+        assert str(template.render(metadata)) == "Author/Author - Title"